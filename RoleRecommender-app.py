@@ -1,6 +1,11 @@
 #---Import of modules and functions---#
 
 import streamlit as st                  
+from utils.preload import start_preload
+
+#---Warm up all data and models in the background (once per server process)---#
+
+start_preload()
 
 #---Start page ---#
 
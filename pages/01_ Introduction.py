@@ -51,7 +51,7 @@ Overall, there are more than 300 possible answers given from the participants. H
 #---Show the Questiionnaire in a table---#
 
 try:
-    df_long = load_df_long()
+    df_long = load_df_long(compact=True)
     st.markdown("##### Questions and Answers")
     # Nur die Spaltennamen als eigene Spalte "Questions"
     column_table = pd.DataFrame({
@@ -1,19 +1,19 @@
 #---Import of modules and functions---#
 
 import streamlit as st
-import pandas as pd
-import matplotlib.pyplot as plt
-import seaborn as sns
-from utils.statistic_functions import test_chisquare
+from utils.statistic_functions import load_cramers_v_matrix, load_resampled_cramers_v, load_target_associations
 from utils.data_loader import (
     load_df_heat_L,
     load_df_heat_S,
     load_question_long_short
 )
 
-from utils.visualizer import (plot_countplots, plot_heatmap_absolute, plot_heatmap_row_percent)
+from utils.visualizer import (plot_countplots, plot_heatmap_absolute, plot_heatmap_row_percent, plot_cramers_v_matrix)
 
 from utils.JanSimonLibrary import overview
+from utils.preload import start_preload
+
+start_preload()  # No-op if the warm-up already runs (e.g. started from the Home page)
 
 #---Start page ---#
 
@@ -87,9 +87,9 @@ selection = st.radio(
 # --- 2. Load the corresponding DataFrame based on the user's selection ---
 try:
     if selection == "**`Broad career role`**":
-        df = load_df_heat_L()
+        df = load_df_heat_L(shared=True)
     else:
-        df = load_df_heat_S()
+        df = load_df_heat_S(shared=True)
 except Exception as e:
     st.error(f"❌ Error loading data: {e}")
     st.stop()
@@ -125,9 +125,9 @@ target_choice = st.radio(
 
 # --- Step 2: Load the chosen dataframe ---
 if target_choice == "**`Broad career role`**":
-    df = load_df_heat_L()
+    df = load_df_heat_L(shared=True)
 else:
-    df = load_df_heat_S()
+    df = load_df_heat_S(shared=True)
 
 # --- Step 3: Load mapping of long question texts to short labels ---
 question_map_long_to_short = load_question_long_short()
@@ -166,8 +166,10 @@ else:
     plot_heatmap_row_percent(df, selected_x_col, y_index=y_index, question_map=question_map_long_to_short)
 
 
-# Step 9: Perform Chi-Square test and display results
-results = test_chisquare(df, df.columns.get_loc(selected_x_col), y_index)
+# Step 9: Chi-Square tests of all questions against the role (computed once per dataset version)
+dataset_key = "L" if target_choice == "**`Broad career role`**" else "S"
+associations = load_target_associations(dataset_key, y_index)
+results = associations.loc[selected_x_col]
 
 st.markdown("""
             ---
@@ -178,6 +180,34 @@ st.write(f"p-value: {results['p-value']:.4f}")
 st.write(f"Degrees of Freedom: {results['Degrees of Freedom']}")
 st.write(f"Cramér's V: {results['Cramers V']:.4f}")
 
+if st.checkbox("Show the uncertainty of Cramér's V (10,000 bootstrap resamples and permutations)"):
+    # Cached per dataset version, question and seed; computed in this process (no worker pool in the server)
+    resampled = load_resampled_cramers_v(dataset_key, df.columns.get_loc(selected_x_col), y_index,
+                                         n_resamples=10000, seed=0, workers=1)
+    st.write(f"Cramér's V: {resampled['Cramers V']:.4f} "
+             f"(95% CI {resampled['CI low']:.4f} – {resampled['CI high']:.4f})")
+    st.write(f"Bias-corrected Cramér's V: {resampled['Cramers V (bias-corrected)']:.4f} "
+             f"(95% CI {resampled['CI low (bias-corrected)']:.4f} – {resampled['CI high (bias-corrected)']:.4f})")
+    st.write(f"Permutation p-value: {resampled['Permutation p-value']:.4f}")
+
+with st.expander("Ranking of all questions by their association with the role"):
+    ranking = associations.sort_values("Cramers V", ascending=False).reset_index()
+    ranking["Question"] = ranking["Question"].map(lambda col: question_map_long_to_short.get(col, col))
+    st.dataframe(
+        ranking.round({"Chi2 Statistic": 2, "p-value": 4, "Cramers V": 4, "Cramers V (bias-corrected)": 4}),
+        use_container_width=True,
+        hide_index=True
+    )
+
+with st.expander("How strongly are the answers related to each other?"):
+    # Pairwise Cramér's V of all questions (incl. the role), built once per dataset version
+    st.pyplot(plot_cramers_v_matrix(
+        load_cramers_v_matrix(dataset_key),
+        question_map=question_map_long_to_short
+    ))
+    st.markdown("> **Dark red cells mark questions that carry largely the same information, "
+                "e.g. years of coding and years of machine learning.**")
+
 
 st.markdown("""### What do these values tell us regarding correlations?
 
@@ -1,15 +1,15 @@
 #---Import of modules and functions---#
 
 import streamlit as st
-import pandas as pd
-import matplotlib.pyplot as plt
-import seaborn as sns
 from utils.visualizer import (plot_confusion_matrix)
 
 from utils.model_loader import (load_classification_report_L,
                                 load_classification_report_S,
                                 load_confusion_matrix_L,
                                 load_confusion_matrix_S)
+from utils.preload import start_preload
+
+start_preload()  # No-op if the warm-up already runs (e.g. started from the Home page)
 
 #---Start page ---#
 
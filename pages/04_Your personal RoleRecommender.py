@@ -2,15 +2,23 @@ import streamlit as st
 import pandas as pd
 
 from utils.data_loader import (
-    load_shap_feature_importance_all_classes_L,
-    load_shap_feature_importance_all_classes_S,
     load_question_long_short,
-    load_default_X_train_L,
-    load_default_X_train_S,
     load_unique_with_rank
 )
-from utils.model_loader import load_model_L, load_model_S
-from utils.visualizer import plot_shap_feature_importance_bar, plot_role_score_benchmark_vs_user
+from utils.variants import VARIANTS, load_variant, variant_labels
+from utils.model_loader import get_model_service
+from utils.response_tables import predict_with_tables, what_if_grid
+from utils.recommender import next_best_actions, optimize_career_path
+from utils.explanations import explain_profile
+from utils.visualizer import (
+    plot_shap_feature_importance_bar,
+    plot_role_score_benchmark_vs_user,
+    plot_local_shap_contributions,
+    plot_what_if_heatmap
+)
+from utils.preload import start_preload
+
+start_preload()  # No-op if the warm-up already runs (e.g. started from the Home page)
 
 
 st.set_page_config(page_title="What matters for your Career?")
@@ -40,37 +48,25 @@ feature_options_with_order = {
 
 # --- 1. Career Focus Selection ---
 st.markdown("#### Choose your Career Focus")
+focus_options = {f"**`{label}`**": key for key, label in variant_labels().items()}
 career_focus = st.radio(
     "Select your type of career focus:",
-    options=["**`Broad career role`**", "**`Specific career role`**"],
+    options=list(focus_options),
     index=0,
     horizontal=True
 )
 
-# --- 2. Category/Role Selection and data/model loading ---
-if career_focus == "**`Broad career role`**":
-    shap_df = load_shap_feature_importance_all_classes_L()
-    model = load_model_L()
-    default_input = load_default_X_train_L()
-    category_columns = ["Data Science", "Tech"]
-    category_map = {
-        "Data Science": "0",
-        "Tech": "1"
-    }
-else:
-    shap_df = load_shap_feature_importance_all_classes_S()
-    model = load_model_S()
-    default_input = load_default_X_train_S()
-    category_columns = ["Data Analyst", "Data Scientist", "Software Engineer"]
-    category_map = {
-        "Data Analyst": "0",
-        "Data Scientist": "1",
-        "Software Engineer": "2"
-    }
+# --- 2. Category/Role Selection and data/model loading (one bundle per variant) ---
+variant = load_variant(focus_options[career_focus])
+shap_df = variant["shap"]
+model = get_model_service(focus_options[career_focus])   # Loaded and warmed up once per process
+default_input = variant["defaults"]
+category_map = variant["classes"]           # UI class name -> model class label
+category_columns = list(category_map)
 
 # Map long question texts to their short forms (if you use mapping)
 question_map = load_question_long_short()
-shap_df["Question"] = shap_df["Question"].map(question_map).fillna(shap_df["Question"])
+shap_df = shap_df.assign(Question=shap_df["Question"].map(question_map).fillna(shap_df["Question"]))
 
 # --- 3. User selects a target role/category ---
 st.markdown("#### Select your specific Role or Category")
@@ -134,6 +130,15 @@ st.markdown(
     unsafe_allow_html=True
 )
 
+target_score = st.slider(
+    "Which score do you want to reach for your selected role (%)?",
+    min_value=10,
+    max_value=95,
+    value=60,
+    step=5,
+    key="target_score_slider"
+)
+
 # --- 8. Prediction Section with Role Score & Barplot ---
 if st.button("Show Career Orientation Probabilities"):
     # Prepare user input DataFrame for prediction
@@ -141,22 +146,19 @@ if st.button("Show Career Orientation Probabilities"):
     for feature, value in user_inputs.items():
         input_df.at[0, feature] = value
 
-    # Predict probabilities for user input and benchmark profile
-    user_proba = model.predict_proba(input_df)
-    benchmark_proba = model.predict_proba(default_input)
+    # Predict probabilities for user input (both career views: precomputed response tables, else one joint
+    # model call) and benchmark profile. Every view gets your answers on top of its own default profile.
+    variant_profiles = {}
+    for key in VARIANTS:
+        variant_profiles[key] = input_df if key == focus_options[career_focus] else load_variant(key)["defaults"].copy()
+        for feature, value in user_inputs.items():
+            if feature in variant_profiles[key].columns:
+                variant_profiles[key].at[0, feature] = value
+    joint_proba = predict_with_tables(variant_profiles)
+    user_proba = joint_proba[focus_options[career_focus]]
+    benchmark_proba = model.benchmark_proba     # = model.predict_proba(default_input), computed once at load time
 
     # Map selected category (UI) to model class label (internal, always as String!)
-    if career_focus == "**`Broad career role`**":
-        category_map = {
-            "Data Science": "0",
-            "Tech": "1"
-        }
-    else:
-        category_map = {
-            "Data Analyst": "0",
-            "Data Scientist": "1",
-            "Software Engineer": "2"
-        }
     selected_model_class = category_map[selected_category]
 
     # ALWAYS compare as strings for robustness!
@@ -171,6 +173,79 @@ if st.button("Show Career Orientation Probabilities"):
     fig = plot_role_score_benchmark_vs_user(benchmark_score, user_score, class_name=selected_category)
     st.pyplot(fig)
 
+    # Both career views side by side (each from your answers on top of its own default profile)
+    with st.expander("Your profile across both career views"):
+        labels = variant_labels()
+        for key, proba in joint_proba.items():
+            class_names = {str(label): name for name, label in VARIANTS[key]["classes"].items()}
+            st.markdown(f"**{labels[key]}**")
+            st.dataframe(
+                pd.DataFrame(
+                    {"Role": [class_names.get(str(c), str(c)) for c in get_model_service(key).classes_],
+                     "Probability (%)": (proba[0] * 100).round(1)}
+                ),
+                use_container_width=True,
+                hide_index=True
+            )
+
+    # Local explanation: how each of *your* answers moves your score (TreeSHAP of the model itself)
+    with st.expander("Why do you get this score?"):
+        local_shap = explain_profile(model, input_df).rename(
+            columns={str(label): name for name, label in category_map.items()}
+        )
+        local_shap["Question"] = local_shap["Question"].map(question_map).fillna(local_shap["Question"])
+        fig = plot_local_shap_contributions(local_shap, selected_category, n_features=n_features)
+        st.pyplot(fig)
+        st.markdown("> **Red bars raise your score for this role, blue bars lower it.**")
+
+    # What-if: every alternative answer of your top features, scored in one batched model call
+    next_steps = next_best_actions(model, input_df, top_features, feature_options_with_order, selected_model_class)
+    next_steps = next_steps[next_steps["Gain (pp)"] > 0].head(10)
+    st.markdown("### Your next best steps")
+    if next_steps.empty:
+        st.markdown(f"No single change of your top features would raise your **{selected_category}** score any further.")
+    else:
+        st.markdown(f"Single changes of your answers that raise your **{selected_category}** score the most:")
+        st.dataframe(
+            next_steps.astype({"Current answer": str, "New answer": str}).round({"Role score (%)": 1, "Gain (pp)": 1}),
+            use_container_width=True,
+            hide_index=True
+        )
+
+    # What-if grid: your score for every combination of the answers of your two top features
+    if len(top_features) >= 2:
+        feature_a, feature_b = top_features[:2]
+        values_a, values_b = feature_options_with_order[feature_a], feature_options_with_order[feature_b]
+        with st.expander("What if you change your answers to your two top features?"):
+            scores = what_if_grid(focus_options[career_focus], input_df, feature_a, values_a, feature_b, values_b)
+            current = (values_a.index(user_inputs[feature_a]), values_b.index(user_inputs[feature_b]))
+            fig = plot_what_if_heatmap(scores[:, :, selected_idx] * 100, values_a, values_b,
+                                       feature_a, feature_b, selected_category, current=current)
+            st.pyplot(fig)
+            st.markdown("> **The framed cell shows your current answers.**")
+
+    # Multi-step path: fewest one-level-up steps of your top features to reach the target score
+    st.markdown(f"### Your path to a {target_score}% {selected_category} score")
+    if user_score >= target_score:
+        st.markdown("You already reach this score with your current answers.")
+    else:
+        career_path = optimize_career_path(
+            model, input_df, top_features, feature_options_with_order, selected_model_class, target_score
+        )
+        if career_path["path"].empty:
+            st.markdown("None of your top features can be raised further.")
+        else:
+            if career_path["reached"]:
+                st.markdown(f"In **{len(career_path['path'])} steps** you can reach your target:")
+            else:
+                st.markdown(f"Your target is out of reach with these features; the best path gets you to "
+                            f"**{career_path['final_score']:.1f}%**:")
+            st.dataframe(
+                career_path["path"].astype({"From": str, "To": str}).round({"Role score (%)": 1}),
+                use_container_width=True,
+                hide_index=True
+            )
+
 
 
     # Optionally show all feature values used for prediction
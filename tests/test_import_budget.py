@@ -0,0 +1,10 @@
+import pytest
+
+from utils.import_budget import PAGE_BUDGETS, check_import_budgets
+
+
+@pytest.mark.parametrize("page", sorted(PAGE_BUDGETS))
+def test_page_stays_within_its_import_budget(page):
+    (result,) = check_import_budgets({page: PAGE_BUDGETS[page]})
+    assert result["ok"], (f"{page}: {result['ms']} ms (budget {result['max_ms']} ms), "
+                          f"heavy libraries imported: {result['heavy']}")
@@ -0,0 +1,21 @@
+import numpy as np
+import pandas as pd
+
+from utils.statistic_functions import resample_cramers_v
+
+
+def test_resample_cramers_v_is_undefined_for_a_constant_column():
+    frame = pd.DataFrame({"answer": ["yes"] * 60,
+                          "role": np.random.default_rng(0).choice(["Data Analyst", "Data Scientist"], 60)})
+    result = resample_cramers_v(frame, 0, 1, n_resamples=200, workers=1)
+    for name in ("Cramers V", "CI low", "CI high", "Cramers V (bias-corrected)",
+                 "CI low (bias-corrected)", "CI high (bias-corrected)", "Permutation p-value"):
+        assert np.isnan(result[name]), name
+
+
+def test_resample_cramers_v_of_independent_columns_is_not_significant():
+    rng = np.random.default_rng(1)
+    frame = pd.DataFrame({"answer": rng.choice(["a", "b", "c"], 300), "role": rng.choice(["x", "y"], 300)})
+    result = resample_cramers_v(frame, 0, 1, n_resamples=500, workers=1)
+    assert result["CI low"] <= result["Cramers V"] <= result["CI high"]
+    assert result["Permutation p-value"] > 0.05
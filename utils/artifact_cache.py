@@ -0,0 +1,185 @@
+#---Import of modules and functions---#
+
+import copy as copy_module
+import hashlib
+import os
+import sys
+import threading
+from collections import OrderedDict
+
+
+#---Process-wide registry for everything the load_* functions read from data/---#
+#---Each artifact is held once per process and reloaded only when its file changes.---#
+
+# Memory budget for all cached artifacts together (in MB), can be overridden per deployment
+DEFAULT_MAX_MB = float(os.environ.get("ROLERECOMMENDER_CACHE_MB", 512))
+
+_lock = threading.RLock()
+_key_locks = {}              # key -> lock held while that artifact is read, so each file is read only once
+_entries = OrderedDict()     # key -> {"fingerprint", "value", "nbytes"}, ordered from least to most recently used
+_max_bytes = int(DEFAULT_MAX_MB * 1024 * 1024)
+_stats = {"hits": 0, "misses": 0, "reloads": 0, "evictions": 0}
+_hash_memo = OrderedDict()   # (path, mtime_ns, size) -> sha256 hex digest, least recently used first
+HASH_MEMO_SIZE = 4096        # Bound of _hash_memo (every edited file version adds an entry)
+
+
+def file_fingerprint(path):
+    """
+    Fingerprint of a file: its sha256 content hash (see content_hash).
+    A changed fingerprint means the cached artifact is stale; touching a file
+    without changing its content does not invalidate anything.
+    For a list of paths (artifacts derived from several files) the fingerprints are combined.
+    """
+    if isinstance(path, (list, tuple)):
+        return tuple(file_fingerprint(p) for p in path)
+    return content_hash(path)
+
+
+def content_hash(path: str) -> str:
+    """
+    sha256 of a file, memoized per (path, mtime, size): the file is only
+    re-hashed after os.stat reports a change, so repeated lookups stay cheap.
+    """
+    stat = os.stat(path)
+    key = (os.path.abspath(path), stat.st_mtime_ns, stat.st_size)
+    with _lock:
+        digest = _hash_memo.get(key)
+        if digest is not None:
+            _hash_memo.move_to_end(key)
+            return digest
+    digest = file_sha256(path)
+    with _lock:
+        _hash_memo[key] = digest
+        while len(_hash_memo) > HASH_MEMO_SIZE:
+            _hash_memo.popitem(last=False)
+    return digest
+
+
+def file_sha256(path: str, block_size: int = 1 << 20) -> str:
+    """
+    Content hash of a file (hex digest), read in blocks.
+    """
+    digest = hashlib.sha256()
+    with open(path, "rb") as f:
+        for block in iter(lambda: f.read(block_size), b""):
+            digest.update(block)
+    return digest.hexdigest()
+
+
+def estimate_nbytes(value, path: str = None) -> int:
+    """
+    Estimate the resident size of a cached artifact.
+    DataFrames report their own memory usage, everything else falls back
+    to the size of the source file (e.g. pickled models) or sys.getsizeof.
+    """
+    if hasattr(value, "memory_usage"):
+        try:
+            usage = value.memory_usage(deep=True)
+            return int(usage.sum() if hasattr(usage, "sum") else usage)
+        except TypeError:
+            pass
+    if path is not None and os.path.exists(path):
+        return os.path.getsize(path)
+    return sys.getsizeof(value)
+
+
+def _evict_to_budget():
+    # Drop least recently used entries until we are back under the budget.
+    # The most recent entry is always kept, even if it alone exceeds the budget.
+    total = sum(entry["nbytes"] for entry in _entries.values())
+    while total > _max_bytes and len(_entries) > 1:
+        _, entry = _entries.popitem(last=False)
+        total -= entry["nbytes"]
+        _stats["evictions"] += 1
+
+
+def _lookup(key, fingerprint, count: bool = True):
+    # Return the cached value if it is still current, else None
+    with _lock:
+        entry = _entries.get(key)
+        if entry is None or entry["fingerprint"] != fingerprint:
+            return None
+        _entries.move_to_end(key)
+        if count:
+            _stats["hits"] += 1
+        return entry["value"]
+
+
+def cached_load(path: str, reader, variant: str = "", copy: bool = True):
+    """
+    Return the artifact stored at `path`, reading it with `reader()` only on a cache miss.
+
+    Parameters:
+    - path: file the artifact is derived from (used for invalidation), or a list of files
+    - reader: zero-argument callable that reads the artifact from disk
+    - variant: extra key part, if the same file is read in different ways
+    - copy: return a copy of DataFrames and a deep copy of dicts/lists (e.g. JSON reports),
+      so one session modifying its result cannot corrupt the artifact for all others
+
+    Returns:
+    - the cached (or freshly loaded) artifact
+    """
+    paths = list(path) if isinstance(path, (list, tuple)) else [path]
+    key = (os.path.abspath(paths[0]), variant)
+    fingerprint = file_fingerprint(paths)
+
+    value = _lookup(key, fingerprint)
+    if value is None:
+        with _lock:
+            key_lock = _key_locks.setdefault(key, threading.Lock())
+        # Read outside the global lock, so different artifacts can load in parallel,
+        # while concurrent requests for the same artifact wait for the first reader
+        with key_lock:
+            value = _lookup(key, fingerprint, count=False)
+            if value is None:
+                value = reader()
+                with _lock:
+                    _stats["misses" if key not in _entries else "reloads"] += 1
+                    _entries[key] = {
+                        "fingerprint": fingerprint,
+                        "value": value,
+                        "nbytes": estimate_nbytes(value, paths[0]),
+                    }
+                    _entries.move_to_end(key)
+                    _evict_to_budget()
+
+    if copy and hasattr(value, "copy") and hasattr(value, "columns"):
+        return value.copy()
+    if copy and isinstance(value, (dict, list)):
+        return copy_module.deepcopy(value)
+    return value
+
+
+def set_cache_budget(max_mb: float):
+    """
+    Change the memory budget (in MB) of the artifact cache and evict if necessary.
+    """
+    global _max_bytes
+    with _lock:
+        _max_bytes = int(max_mb * 1024 * 1024)
+        _evict_to_budget()
+
+
+def clear_cache():
+    """
+    Remove all cached artifacts and reset the hit/miss counters.
+    """
+    with _lock:
+        _entries.clear()
+        for name in _stats:
+            _stats[name] = 0
+
+
+def cache_stats() -> dict:
+    """
+    Hit/miss counters and the current memory footprint of the artifact cache.
+    """
+    with _lock:
+        lookups = _stats["hits"] + _stats["misses"] + _stats["reloads"]
+        return {
+            **_stats,
+            "hit_rate": _stats["hits"] / lookups if lookups else 0.0,
+            "entries": len(_entries),
+            "nbytes": sum(entry["nbytes"] for entry in _entries.values()),
+            "max_bytes": _max_bytes,
+        }
@@ -0,0 +1,180 @@
+from __future__ import annotations   # Type hints stay strings, so pd.DataFrame does not import pandas
+
+#---Import of modules and functions---#
+
+import argparse
+import os
+import sys
+import time
+from collections import deque
+from concurrent.futures import ProcessPoolExecutor
+
+from utils.artifact_cache import cached_load
+from utils.lazy_import import lazy_module
+from utils.variants import DATA_PATH, VARIANTS
+
+pd = lazy_module("pandas")
+np = lazy_module("numpy")
+
+
+#---Batch scoring of many profiles at once, without Streamlit---#
+#---Input: CSV in the schema of default_X_train_L.csv (one profile per row, ';' separated).---#
+#---The file is read in chunks; every chunk is scored in one vectorized predict_proba call per model,---#
+#---chunks run in parallel worker processes (one per core) and are written back in input order.---#
+#---Command line:  python -m utils.batch_scoring profiles.csv scores.csv [--models L S] [--workers 4]---#
+#---With --engine native the workers load the UBJSON booster + preprocessing spec (utils/model_format.py),---#
+#---with --engine compiled they score with utils/tree_evaluator.py (NumPy only); neither unpickles.---#
+#---native (the default) reproduces the pickled pipeline bit for bit; compiled sums the leaf values in---#
+#---float64 instead of XGBoost's float32, so its probabilities are approximate (within about 1e-6).---#
+
+DEFAULT_CHUNKSIZE = 5000
+ENGINES = ("pipeline", "native", "compiled")
+DEFAULT_ENGINE = "native"
+
+
+def load_pipeline(key: str, engine: str = DEFAULT_ENGINE):
+    """
+    The model of a variant ('L' or 'S'), held once per process: the fitted pipeline,
+    the same model in the native format (engine='native', bit-identical probabilities)
+    or its compiled NumPy copy (engine='compiled', approximate: probabilities within about 1e-6).
+    """
+    if engine == "native":
+        from utils.model_loader import load_native_model
+        return load_native_model(key)
+    if engine == "compiled":
+        from utils.tree_evaluator import load_compiled_model
+        return load_compiled_model(key)
+    from utils.model_loader import load_pickled_model
+    model_path = os.path.join(DATA_PATH, VARIANTS[key]["files"]["model"])
+    return cached_load(model_path, lambda: load_pickled_model(model_path))
+
+
+def probability_columns(key: str, engine: str = DEFAULT_ENGINE) -> list:
+    """
+    Output column names of a variant, in the order of model.classes_, e.g. ['L: Data Science', 'L: Tech'].
+    """
+    class_names = {str(label): name for name, label in VARIANTS[key]["classes"].items()}
+    return [f"{key}: {class_names.get(str(label), label)}" for label in load_pipeline(key, engine).classes_]
+
+
+def score_frame(df: pd.DataFrame, keys=("L", "S"), engine: str = DEFAULT_ENGINE) -> pd.DataFrame:
+    """
+    Class probabilities of every profile in df for every model.
+
+    Parameters:
+    - df: profiles, one per row, with (at least) the feature columns of default_X_train_*.csv
+    - keys: variants to score, e.g. ('L', 'S')
+    - engine: 'native' (utils/model_format.py, default), 'pipeline' (pickled sklearn pipeline) or
+      'compiled' (utils/tree_evaluator.py, approximate within about 1e-6)
+
+    Returns:
+    - DataFrame with one probability column per class and model (same index as df)
+    """
+    scores = []
+    for key in keys:
+        model = load_pipeline(key, engine)
+        features = list(model.feature_names_in_)
+        missing = [column for column in features if column not in df.columns]
+        if missing:
+            raise ValueError(f"Input is missing {len(missing)} feature column(s) of model {key}: {missing[:3]} ...")
+        proba = model.predict_proba(df[features])
+        scores.append(pd.DataFrame(proba, columns=probability_columns(key, engine), index=df.index))
+    return pd.concat(scores, axis=1)
+
+
+def _score_chunk(chunk: pd.DataFrame, keys, id_column, engine):
+    scores = score_frame(chunk, keys, engine)
+    if id_column is not None:
+        scores.insert(0, id_column, chunk[id_column].values)
+    return scores
+
+
+def _warm_worker(keys, engine):
+    # Load the models once per worker process, before the first chunk arrives
+    for key in keys:
+        load_pipeline(key, engine)
+
+
+def iter_scored_chunks(input_path: str, keys=("L", "S"), chunksize: int = DEFAULT_CHUNKSIZE,
+                       workers: int = None, id_column: str = None, sep: str = ';', engine: str = DEFAULT_ENGINE):
+    """
+    Stream a profile CSV and yield the scored chunks in input order.
+
+    Parameters:
+    - input_path: CSV with one profile per row
+    - keys: variants to score
+    - chunksize: rows per chunk (= per vectorized predict call)
+    - workers: worker processes; default: all cores. 1 scores in this process.
+    - id_column: input column copied to the output (e.g. an employee id)
+    - sep: separator of the input file
+    - engine: 'native' (default), 'pipeline' or 'compiled'
+
+    Returns:
+    - generator of DataFrames with the probabilities of each chunk
+    """
+    workers = workers or os.cpu_count() or 1
+    reader = pd.read_csv(input_path, sep=sep, encoding='utf-8-sig', chunksize=chunksize)
+
+    if workers == 1:
+        for chunk in reader:
+            yield _score_chunk(chunk, keys, id_column, engine)
+        return
+
+    with ProcessPoolExecutor(max_workers=workers, initializer=_warm_worker, initargs=(tuple(keys), engine)) as pool:
+        pending = deque()
+        for chunk in reader:
+            pending.append(pool.submit(_score_chunk, chunk, keys, id_column, engine))
+            if len(pending) >= 2 * workers:   # Bounded read-ahead keeps memory flat for any file size
+                yield pending.popleft().result()
+        while pending:
+            yield pending.popleft().result()
+
+
+def score_csv(input_path: str, output_path: str, keys=("L", "S"), chunksize: int = DEFAULT_CHUNKSIZE,
+              workers: int = None, id_column: str = None, sep: str = ';', engine: str = DEFAULT_ENGINE) -> dict:
+    """
+    Score a profile CSV and write the probabilities (';' separated, same row order) to output_path.
+
+    Returns:
+    - dict with 'rows', 'chunks' and 'seconds'
+    """
+    start = time.perf_counter()
+    rows = chunks = 0
+    tmp_path = f"{output_path}.{os.getpid()}.tmp"
+    with open(tmp_path, "w", encoding="utf-8-sig", newline="") as f:
+        for scores in iter_scored_chunks(input_path, keys, chunksize, workers, id_column, sep, engine):
+            scores.to_csv(f, sep=';', index=False, header=(chunks == 0))
+            rows += len(scores)
+            chunks += 1
+    os.replace(tmp_path, output_path)
+    return {"rows": rows, "chunks": chunks, "seconds": time.perf_counter() - start}
+
+
+def main(argv=None) -> int:
+    parser = argparse.ArgumentParser(
+        prog="python -m utils.batch_scoring",
+        description="Score many profiles (CSV in the schema of data/default_X_train_L.csv) with the RoleRecommender models.",
+    )
+    parser.add_argument("input", help="CSV file with one profile per row")
+    parser.add_argument("output", help="CSV file for the class probabilities")
+    parser.add_argument("--models", nargs="+", default=["L", "S"], choices=sorted(VARIANTS),
+                        help="models to score (default: all)")
+    parser.add_argument("--chunksize", type=int, default=DEFAULT_CHUNKSIZE, help="rows per chunk")
+    parser.add_argument("--workers", type=int, default=None, help="worker processes (default: all cores)")
+    parser.add_argument("--id-column", default=None, help="input column to copy into the output")
+    parser.add_argument("--sep", default=';', help="separator of the input file (default: ';')")
+    parser.add_argument("--engine", default=DEFAULT_ENGINE, choices=ENGINES,
+                        help="'native' (default) loads booster + preprocessing spec instead of the pickle, same "
+                             "probabilities as 'pipeline'; 'compiled' scores with the NumPy tree evaluator "
+                             "(no scikit-learn/xgboost needed, probabilities approximate within about 1e-6)")
+    args = parser.parse_args(argv)
+
+    result = score_csv(args.input, args.output, keys=args.models, chunksize=args.chunksize,
+                       workers=args.workers, id_column=args.id_column, sep=args.sep, engine=args.engine)
+    print(f"Scored {result['rows']} profiles in {result['chunks']} chunks ({result['seconds']:.1f} s) -> {args.output}",
+          file=sys.stderr)
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,223 @@
+from __future__ import annotations   # Type hints stay strings, so pd.DataFrame does not import pandas
+
+#---Import of modules and functions---#
+
+import hashlib
+import os
+from utils.lazy_import import lazy_module
+from utils.artifact_cache import file_fingerprint
+
+np = lazy_module("numpy")
+pd = lazy_module("pandas")
+
+
+#---Columnar binary cache for the survey CSVs---#
+#---All columns are stored as small integer codes in one (n_columns x n_rows) matrix plus their vocabularies---#
+#---(one array per value type), in one .npz file next to the data. The vocabularies are already in ranked---#
+#---category order, so a compact read is one Categorical.from_codes per column, without any reordering.---#
+#---The .npz is derived once from the CSV and rebuilt automatically as soon as the CSV content changes.---#
+
+CACHE_DIR = os.path.join(os.path.dirname(os.path.dirname(__file__)), "data", "_cache")
+FORMAT_VERSION = 3
+VOCAB_ARRAYS = {"s": "__vocab_str__", "f": "__vocab_float__", "i": "__vocab_int__", "u": "__vocab_int__",
+                "b": "__vocab_int__"}
+
+
+def cache_path_for(data_path: str, suffix: str = ".npz") -> str:
+    """
+    Path of the derived cache file for a data file (e.g. data/_cache/df_heat_L.1a2b3c4d5e6f.npz).
+    The name contains a hash of the absolute path, so files with the same name in different
+    directories get different cache files.
+    """
+    name = os.path.splitext(os.path.basename(data_path))[0]
+    path_hash = hashlib.sha256(os.path.abspath(data_path).encode("utf-8")).hexdigest()[:12]
+    return os.path.join(CACHE_DIR, f"{name}.{path_hash}{suffix}")
+
+
+def code_dtype(n_values: int):
+    # Smallest signed integer type that can hold all codes plus -1 for missing values
+    return np.int8 if n_values < 127 else np.int16 if n_values < 32767 else np.int32
+
+
+def order_key(columns, category_order: dict = None) -> str:
+    """
+    Fingerprint of the category order used for a set of columns (stored with the cache).
+    """
+    category_order = category_order or {}
+    return hashlib.sha256(repr([(str(col), category_order.get(str(col))) for col in columns]).encode("utf-8")).hexdigest()
+
+
+def encode_columns(df: pd.DataFrame, category_order: dict = None) -> dict:
+    """
+    Turn every column of a DataFrame into integer codes and a vocabulary in ranked order
+    (see ranked_categories; sorted if the column has no rank).
+
+    Missing values get code -1. Numeric and bool columns keep their dtype; other columns
+    must hold strings only (ValueError otherwise, e.g. for mixed int/str columns).
+
+    Returns:
+    - dict of NumPy arrays, ready for np.savez
+    """
+    category_order = category_order or {}
+    codes = np.empty((df.shape[1], df.shape[0]), dtype=np.int32)
+    vocabs = {name: [] for name in set(VOCAB_ARRAYS.values())}
+    kinds, dtypes, starts, lengths = [], [], [], []
+    for i, col in enumerate(df.columns):
+        column_codes, uniques = pd.factorize(df[col], sort=True)
+        kind = df[col].dtype.kind if df[col].dtype.kind in "iufb" else "s"
+        if kind == "s" and not all(isinstance(value, str) for value in uniques):
+            raise ValueError(f"Column {col!r} mixes strings with other types")
+        uniques = list(np.asarray(uniques, dtype=df[col].dtype if kind != "s" else object))
+        ranked = ranked_categories(uniques, category_order.get(col))
+        position = {value: j for j, value in enumerate(ranked)}
+        remap = np.array([position[value] for value in uniques] + [-1], dtype=np.int32)
+        codes[i] = remap[column_codes]   # Code -1 (missing) picks the trailing -1
+
+        vocab = vocabs[VOCAB_ARRAYS[kind]]
+        kinds.append(kind)
+        dtypes.append(str(df[col].dtype) if kind != "s" else "str")
+        starts.append(len(vocab))
+        lengths.append(len(ranked))
+        vocab.extend(ranked)
+
+    return {
+        "__columns__": np.array(df.columns, dtype=str),
+        "__kinds__": np.array(kinds, dtype=str),
+        "__dtypes__": np.array(dtypes, dtype=str),
+        "__vocab_start__": np.array(starts, dtype=np.int64),
+        "__vocab_len__": np.array(lengths, dtype=np.int64),
+        "__order__": np.array(order_key(df.columns, category_order)),
+        "__codes__": codes.astype(code_dtype(max(lengths, default=0))),
+        "__vocab_str__": np.array(vocabs["__vocab_str__"], dtype=str),
+        "__vocab_float__": np.array(vocabs["__vocab_float__"], dtype=np.float64),
+        "__vocab_int__": np.array(vocabs["__vocab_int__"], dtype=np.int64),
+    }
+
+
+def answer_key(value) -> str:
+    """
+    Canonical string form of an answer, so 3, 3.0 and "3" are treated as the same answer.
+    """
+    if isinstance(value, (float, np.floating)) and float(value).is_integer():
+        return str(int(value))
+    return str(value)
+
+
+def ranked_categories(vocab, rank=None) -> list:
+    """
+    Order a column vocabulary: values listed in `rank` (e.g. a column of
+    unique_with_rank.csv) come first in rank order, all others follow sorted.
+    """
+    vocab = list(vocab)
+    if not rank:
+        return vocab
+    position = {answer_key(value): i for i, value in enumerate(rank)}
+    ranked = sorted((v for v in vocab if answer_key(v) in position), key=lambda v: position[answer_key(v)])
+    return ranked + [v for v in vocab if answer_key(v) not in position]
+
+
+def compact_frame(df: pd.DataFrame, category_order: dict = None) -> pd.DataFrame:
+    """
+    Dictionary-encode every column of a DataFrame as a pandas Categorical
+    (int8/int16 codes plus one shared vocabulary per column).
+
+    Parameters:
+    - df: DataFrame with low-cardinality answer columns
+    - category_order: optional dict column -> ranked answers (see ranked_categories)
+    """
+    category_order = category_order or {}
+    data = {}
+    for col in df.columns:
+        codes, uniques = pd.factorize(df[col], sort=True)
+        categorical = pd.Categorical.from_codes(codes, categories=uniques)
+        data[col] = categorical.reorder_categories(ranked_categories(uniques, category_order.get(col)))
+    return pd.DataFrame(data, columns=df.columns, index=df.index)
+
+
+def decode_columns(arrays, compact: bool = False) -> pd.DataFrame:
+    """
+    Rebuild the original DataFrame from the arrays written by encode_columns.
+    With compact=True the stored codes are used directly as Categorical columns
+    (categories in the ranked order the cache was written with).
+    """
+    arrays = {name: arrays[name] for name in arrays}   # Read every array of an npz file once
+    columns = arrays["__columns__"].tolist()
+    codes = arrays["__codes__"]
+    string_dtype = pd.Series(["a"]).dtype   # The dtype pd.read_csv gives text columns (str or object)
+    data = {}
+    for i, (col, kind, dtype) in enumerate(zip(columns, arrays["__kinds__"].tolist(), arrays["__dtypes__"].tolist())):
+        start = int(arrays["__vocab_start__"][i])
+        vocab = arrays[VOCAB_ARRAYS[kind]][start:start + int(arrays["__vocab_len__"][i])]
+        if kind != "s":
+            vocab = vocab.astype(dtype)
+        if compact:
+            data[col] = pd.Categorical.from_codes(codes[i], dtype=pd.CategoricalDtype(vocab), validate=False)
+            continue
+        if kind == "s":
+            # Gather from the small vocabulary array; code -1 becomes a missing value
+            data[col] = pd.array(vocab.astype(object), dtype=string_dtype).take(codes[i].astype(np.intp), allow_fill=True)
+            continue
+        if (codes[i] < 0).any():
+            # Missing values in a numeric column (float, as pd.read_csv returns them)
+            vocab = np.append(vocab.astype(np.float64), np.nan)
+        data[col] = vocab[codes[i]]
+    return pd.DataFrame(data, columns=columns)
+
+
+def _options_key(read_options: dict) -> str:
+    return repr(sorted(read_options.items()))
+
+
+def read_csv_columnar(data_path: str, compact: bool = False, category_order: dict = None,
+                      **read_options) -> pd.DataFrame:
+    """
+    Read a CSV via its columnar .npz cache.
+
+    The cache is used if it was derived from the current version of the CSV
+    with the same read options (and, for compact=True, the same category order);
+    otherwise the CSV is parsed and the cache rebuilt.
+    Any problem with the cache falls back to the plain CSV transparently.
+    With compact=True the result is dictionary-encoded (see compact_frame).
+    """
+    cache_path = cache_path_for(data_path)
+    source = file_fingerprint(data_path)   # Content hash of the CSV
+    options = _options_key(read_options)
+
+    # Try the cache first
+    try:
+        with np.load(cache_path, allow_pickle=False) as arrays:
+            if (int(arrays["__version__"]) == FORMAT_VERSION
+                    and str(arrays["__source__"]) == source
+                    and str(arrays["__options__"]) == options
+                    and (not compact or str(arrays["__order__"]) == order_key(arrays["__columns__"], category_order))):
+                return decode_columns(arrays, compact=compact)
+    except (OSError, KeyError, ValueError):
+        pass
+
+    # Cache missing or stale: parse the CSV and rebuild the cache
+    df = pd.read_csv(data_path, **read_options)
+    try:
+        write_columnar_cache(df, cache_path, source=source, options=options, category_order=category_order)
+    except (OSError, ValueError, TypeError):
+        pass  # e.g. read-only deployment; the CSV result is still returned
+    return compact_frame(df, category_order) if compact else df
+
+
+def write_columnar_cache(df: pd.DataFrame, cache_path: str, source, options: str = "", category_order: dict = None):
+    """
+    Write the .npz cache atomically, so concurrent readers never see half a file.
+    Raises ValueError (nothing is written) if the arrays would not decode to exactly df
+    (plain) and to exactly compact_frame(df, category_order) (compact).
+    """
+    os.makedirs(os.path.dirname(cache_path), exist_ok=True)
+    arrays = encode_columns(df, category_order)
+    if not (decode_columns(arrays).equals(df.reset_index(drop=True))   # Round-trip checks
+            and decode_columns(arrays, compact=True).equals(compact_frame(df, category_order).reset_index(drop=True))):
+        raise ValueError("Columnar encoding does not round-trip")
+    arrays["__version__"] = np.array(FORMAT_VERSION)
+    arrays["__source__"] = np.array(source)
+    arrays["__options__"] = np.array(options)
+    tmp_path = f"{cache_path}.{os.getpid()}.tmp"
+    with open(tmp_path, "wb") as f:
+        np.savez(f, **arrays)
+    os.replace(tmp_path, cache_path)
@@ -1,72 +1,187 @@
 import os                               # For filenames, etc.
-import pandas as pd                     # For data manipulation
-import numpy as np                      # For numerical operations
 import json                             # Allows uploading json files
+import copy                             # Deep copies of shared (bundled) artifacts
+from utils.artifact_cache import cached_load, file_fingerprint   # Process-wide cache for all artifacts in data/
+from utils.columnar_cache import read_csv_columnar, compact_frame   # Binary .npz cache / compact categorical frames
+from utils.shared_store import attach_dataset, publish_dataset   # Memory-mapped store shared by all processes
+from utils.questionnaire_bundle import load_questionnaire_bundle   # Pre-compiled questionnaire (no Excel parsing)
+from utils.lazy_import import lazy_module   # Heavy libraries are imported on first use
+
+pd = lazy_module("pandas")                # For data manipulation
+np = lazy_module("numpy")                 # For numerical operations
 
 #---This is are the original data from Kaggle---#
 
-def kaggle_survey(filename='kaggle_survey_2020_responses.csv'):
+def kaggle_survey(filename='kaggle_survey_2020_responses.csv', compact=False):
     base_path = os.path.dirname(os.path.dirname(__file__))  # geht aus /utils/ raus
     data_path = os.path.join(base_path, "data", filename)
-    return pd.read_csv(data_path, sep=',',dtype = 'str')
+    if compact:
+        # Dictionary-encoded answers (see load_df_heat_L), much smaller than one string object per cell
+        return cached_load(data_path, lambda: compact_frame(pd.read_csv(data_path, sep=',', dtype='str')),
+                           variant="compact")
+    return cached_load(data_path, lambda: pd.read_csv(data_path, sep=',', dtype='str'))
+
+#---Streaming variant: yields the Kaggle survey in chunks, optionally only some questions---#
+
+def iter_kaggle_survey(filename='kaggle_survey_2020_responses.csv', questions=None, chunksize=5000,
+                       compact=True, categories=None, skip_question_row=True):
+    """
+    Read the raw Kaggle survey chunk by chunk with bounded memory.
+
+    Parameters:
+    - questions: question prefixes to keep, e.g. ['Q5', 'Q6'] (None = all columns)
+    - chunksize: number of respondents per chunk
+    - compact: convert every chunk to Categoricals (see compact_frame)
+    - categories: optional dict column -> fixed list of answers, so all chunks share one vocabulary
+    - skip_question_row: drop the second line of the file, which holds the question texts
+
+    Yields:
+    - one DataFrame per chunk
+    """
+    base_path = os.path.dirname(os.path.dirname(__file__))
+    data_path = os.path.join(base_path, "data", filename)
+    usecols = _question_filter(questions)
+    yield from _stream_csv(data_path, chunksize, compact, categories,
+                           sep=',', dtype='str', usecols=usecols,
+                           skiprows=[1] if skip_question_row else None)
 
 #---This is the list of all Q&As from the Kaggle qustionnaire. Derived from the RoleRecommnder notebook (v0.61)---#
 
 def load_questionnaire(filename='Questionaire.xlsx', sheet_name=0):
+    if filename == 'Questionaire.xlsx' and sheet_name == 0:
+        # Served from data/questionnaire_bundle.json, the Excel file is only read when it changed
+        return load_questionnaire_bundle()["questionnaire"].copy()
     base_path = os.path.dirname(os.path.dirname(__file__))  # geht aus /utils/ raus
     data_path = os.path.join(base_path, "data", filename)
-    return pd.read_excel(data_path, sheet_name=sheet_name, index_col=0)
+    return cached_load(data_path, lambda: pd.read_excel(data_path, sheet_name=sheet_name, index_col=0),
+                       variant=f"sheet={sheet_name}")
 
 
 #---Creates a dicitonary 'Questiones long - Questions short' derive from in df_heat (see function below)---#
 
 def load_question_long_short(filename='question_long_short.csv'):
+    if filename == 'question_long_short.csv':
+        # Same table as below, but served from the pre-compiled questionnaire bundle
+        rows = load_questionnaire_bundle()["question_long_short"]
+        return dict(zip(rows[0], rows[1]))
     # Get base directory
     base_path = os.path.dirname(os.path.dirname(__file__))
     # Build path to the CSV file
     data_path = os.path.join(base_path, "data", filename)
-    # Load CSV without header because row 0 = long texts, row 1 = short texts
-    df = pd.read_csv(data_path, sep=';', header=None)
-    # Extract long texts from first row
-    long_texts = df.iloc[0].tolist()
-    # Extract short texts from second row
-    short_texts = df.iloc[1].tolist()
-    # Create dictionary mapping long texts (keys) to short texts (values)
-    return dict(zip(long_texts, short_texts))
+
+    def read():
+        # Load CSV without header because row 0 = long texts, row 1 = short texts
+        df = pd.read_csv(data_path, sep=';', header=None)
+        # Extract long texts from first row
+        long_texts = df.iloc[0].tolist()
+        # Extract short texts from second row
+        short_texts = df.iloc[1].tolist()
+        # Create dictionary mapping long texts (keys) to short texts (values)
+        return dict(zip(long_texts, short_texts))
+
+    return dict(cached_load(data_path, read))
 
 
 #---This is the data basically with all data, but we made it handable (look at the notebook RoleRecommender, latest version)---#
 
-def load_df_long(filename='df_long.csv'):
+def load_df_long(filename='df_long.csv', compact=False):
     base_path = os.path.dirname(os.path.dirname(__file__))  # geht aus /utils/ raus
     data_path = os.path.join(base_path, "data", filename)
-    df_long = pd.read_csv(data_path, sep=';')
-    df_long = df_long.iloc[:, 1:]  # Entfernt die erste Spalte (z. B. 'Unnamed: 0')
-    return df_long
+
+    def read():
+        df_long = pd.read_csv(data_path, sep=';')
+        df_long = df_long.iloc[:, 1:]  # Entfernt die erste Spalte (z. B. 'Unnamed: 0')
+        return compact_frame(df_long, load_category_order()) if compact else df_long
+
+    return cached_load(data_path, read, variant="compact" if compact else "")
+
+#---Streaming variant of load_df_long (same projection and conversion options as iter_kaggle_survey)---#
+
+def iter_df_long(filename='df_long.csv', questions=None, chunksize=5000, compact=True, categories=None):
+    base_path = os.path.dirname(os.path.dirname(__file__))
+    data_path = os.path.join(base_path, "data", filename)
+    # Read only the header to drop the first column (e.g. 'Unnamed: 0') without loading it
+    header = pd.read_csv(data_path, sep=';', nrows=0).columns[1:]
+    keep = _question_filter(questions)
+    usecols = [col for col in header if keep is None or keep(col)]
+    yield from _stream_csv(data_path, chunksize, compact, categories, sep=';', usecols=usecols)
+
+
+def _question_filter(questions):
+    # Column projection by question prefix: 'Q6' keeps 'Q6' and 'Q6_...' but not 'Q60_...'
+    if questions is None:
+        return None
+    prefixes = tuple(questions)
+    return lambda col: any(col == q or col.startswith(q + "_") for q in prefixes)
+
+
+def _stream_csv(data_path, chunksize, compact, categories, **read_options):
+    category_order = load_category_order() if compact else None
+    for chunk in pd.read_csv(data_path, chunksize=chunksize, **read_options):
+        if compact:
+            chunk = compact_frame(chunk, category_order)
+        if categories:
+            # Fixed vocabularies: every chunk gets the same codes for the same answer
+            chunk = chunk.astype({col: pd.CategoricalDtype(cats) for col, cats in categories.items()
+                                  if col in chunk.columns})
+        yield chunk
 
 #---This is the data for the data visualization and machine learning training and test stet.-(L)--#
 
-def load_df_heat_L(filename='df_heat_L.csv'):
+def load_df_heat_L(filename='df_heat_L.csv', compact=False, shared=False):
+    """
+    Load df_heat_L. With compact=True every question is a Categorical
+    (int8 codes + one vocabulary per column, ordered like unique_with_rank.csv).
+    With shared=True the compact codes are memory-mapped from the host-wide shared store.
+    """
     # Get base project directory (two levels up from this file)
     base_path = os.path.dirname(os.path.dirname(__file__))
     # Build full path to data file inside 'data/' folder
     data_path = os.path.join(base_path, "data", filename)
-    # Load CSV with semicolon separator and return DataFrame
-    return pd.read_csv(data_path, sep=';')
+    if shared:
+        return load_shared_dataset(data_path)
+    # Load CSV with semicolon separator via its columnar cache and return DataFrame (cached per process)
+    category_order = load_category_order() if compact else None
+    return cached_load(data_path, lambda: read_csv_columnar(data_path, compact=compact, category_order=category_order, sep=';'),
+                       variant="compact" if compact else "")
 
 #---This is the data for the data visualization and machine learning training and test set.-(S)--#
 
-def load_df_heat_S(filename='df_heat_S.csv'):
+def load_df_heat_S(filename='df_heat_S.csv', compact=False, shared=False):
     # Same as above, but loads the "role-specific" dataset
     base_path = os.path.dirname(os.path.dirname(__file__))
     data_path = os.path.join(base_path, "data", filename)
-    return pd.read_csv(data_path, sep=';')
+    if shared:
+        return load_shared_dataset(data_path)
+    category_order = load_category_order() if compact else None
+    return cached_load(data_path, lambda: read_csv_columnar(data_path, compact=compact, category_order=category_order, sep=';'),
+                       variant="compact" if compact else "")
+
+#---Attach to the read-only shared store of a survey dataset (publishes it on first use)---#
+
+def load_shared_dataset(data_path):
+    name = os.path.splitext(os.path.basename(data_path))[0]
+    source_token = file_fingerprint(data_path)[:16]   # Content hash of the CSV
+
+    def read():
+        df = attach_dataset(name, source_token)
+        if df is None:
+            compact_df = read_csv_columnar(data_path, compact=True, category_order=load_category_order(), sep=';')
+            try:
+                publish_dataset(name, compact_df, source_token)
+            except OSError:
+                return compact_df  # Store not writable: fall back to a private compact copy
+            df = attach_dataset(name, source_token)
+        return df
+
+    # Shallow copy: callers can add/replace columns, the mapped codes stay shared
+    return cached_load(data_path, read, variant="shared", copy=False).copy(deep=False)
 
 #--- This csv-file contains the data of the SHAP values for y_L'.---#
 def load_shap_feature_importance_all_classes_L(filename='shap_feature_importance_all_classes_L.csv'):
     base_path = os.path.dirname(os.path.dirname(__file__))  # geht aus /utils/ raus
     data_path = os.path.join(base_path, "data", filename)
-    df = pd.read_csv(data_path, sep=';')     # Read the .csv
+    df = cached_load(data_path, lambda: pd.read_csv(data_path, sep=';'))     # Read the .csv (cached)
     # Rename the columns    
     df = df.rename(columns={df.columns[0]: 
                             'Question', 
@@ -82,7 +197,7 @@ def load_shap_feature_importance_all_classes_L(filename='shap_feature_importance
 def load_shap_feature_importance_all_classes_S(filename='shap_feature_importance_all_classes_S.csv'):
     base_path = os.path.dirname(os.path.dirname(__file__))  # geht aus /utils/ raus
     data_path = os.path.join(base_path, "data", filename)
-    df = pd.read_csv(data_path, sep=';')     # Read the .csv
+    df = cached_load(data_path, lambda: pd.read_csv(data_path, sep=';'))     # Read the .csv (cached)
     # Rename the columns    
     df = df.rename(columns={df.columns[0]: 
                             'Question', 
@@ -102,8 +217,12 @@ def load_unique_values_per_feature_L(filename='unique_values_per_feature_L.json'
     """
     base_path = os.path.dirname(os.path.dirname(__file__))
     report_path = os.path.join(base_path, "data", filename)
-    with open(report_path, "r", encoding="utf-8-sig") as f:
-        return json.load(f)
+
+    def read():
+        with open(report_path, "r", encoding="utf-8-sig") as f:
+            return json.load(f)
+
+    return cached_load(report_path, read)
 
 #--- This json-file contains the data of selection field for the features in (S).---#
 
@@ -113,8 +232,12 @@ def load_unique_values_per_feature_S(filename='unique_values_per_feature_S.json'
     """
     base_path = os.path.dirname(os.path.dirname(__file__))
     report_path = os.path.join(base_path, "data", filename)
-    with open(report_path, "r", encoding="utf-8-sig") as f:
-        return json.load(f)
+
+    def read():
+        with open(report_path, "r", encoding="utf-8-sig") as f:
+            return json.load(f)
+
+    return cached_load(report_path, read)
     
 #--- This csv-file the default values for each feature (L).---#
     
@@ -122,7 +245,7 @@ def load_default_X_train_L(filename='default_X_train_L.csv'):
     # Same as above, but loads the "role-specific" dataset
     base_path = os.path.dirname(os.path.dirname(__file__))
     data_path = os.path.join(base_path, "data", filename)
-    return pd.read_csv(data_path, sep=';', encoding='utf-8-sig')
+    return cached_load(data_path, lambda: pd.read_csv(data_path, sep=';', encoding='utf-8-sig'))
 
 #--- This csv-file the default values for each feature (S).---#
 
@@ -130,13 +253,30 @@ def load_default_X_train_S(filename='default_X_train_S.csv'):
     # Same as above, but loads the "role-specific" dataset
     base_path = os.path.dirname(os.path.dirname(__file__))
     data_path = os.path.join(base_path, "data", filename)
-    return pd.read_csv(data_path, sep=';', encoding='utf-8-sig')
+    return cached_load(data_path, lambda: pd.read_csv(data_path, sep=';', encoding='utf-8-sig'))
 
 def load_unique_with_rank(filename='unique_with_rank.csv'):
+    if filename == 'unique_with_rank.csv':
+        return load_questionnaire_bundle()["unique_with_rank"].copy()
     # Same as above, but loads the "role-specific" dataset
     base_path = os.path.dirname(os.path.dirname(__file__))
     data_path = os.path.join(base_path, "data", filename)
-    return pd.read_csv(data_path, sep=';')
+    return cached_load(data_path, lambda: pd.read_csv(data_path, sep=';'))
+
+#--- Answer categories of the ordinal encoder and the encoder type per question (from the questionnaire bundle) ---#
+
+def load_categories():
+    # Deep copy: the bundle is shared by all sessions
+    return copy.deepcopy(load_questionnaire_bundle()["categories"])
+
+def load_encoder_assignment():
+    return load_questionnaire_bundle()["encoder_assignment"].copy()
+
+#--- Ranked answers per question (from unique_with_rank.csv), used to order compact categories ---#
+
+def load_category_order():
+    rank_df = load_unique_with_rank()
+    return {col: [v for v in rank_df[col] if pd.notnull(v)] for col in rank_df.columns}
 
 # --- This is the path loader for the PNG "Structuring the App with Modules.png" --- #
 
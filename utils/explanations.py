@@ -0,0 +1,119 @@
+from __future__ import annotations   # Type hints stay strings, so pd.DataFrame does not import pandas
+
+#---Import of modules and functions---#
+
+import os
+import threading
+from utils.lazy_import import lazy_module
+from utils.prediction_cache import DEFAULT_TTL_SECONDS, ResultCache
+
+np = lazy_module("numpy")
+pd = lazy_module("pandas")
+xgb = lazy_module("xgboost")
+
+
+#---Local (per-profile) SHAP explanations from the booster's native TreeSHAP (pred_contribs)---#
+#---Contributions are computed for the encoded columns and summed back to the questionnaire features---#
+#---(all one-hot columns of a question belong to that question). Values are in log-odds (margin) units:---#
+#---bias + sum of all contributions = the model's raw score of the class.---#
+
+EXPLANATION_CACHE_SIZE = int(os.environ.get("ROLERECOMMENDER_EXPLANATION_CACHE_SIZE", 1024))
+
+_explanations = ResultCache(EXPLANATION_CACHE_SIZE, DEFAULT_TTL_SECONDS)   # Separate from the prediction cache
+_aggregators = {}   # model hash -> (feature names, encoded column -> feature matrix)
+_aggregators_lock = threading.Lock()
+
+
+def _questionnaire_order(features: list) -> list:
+    # Positions that sort features as in the questionnaire (Q1, Q2, ...); derived features such as
+    # 'Q7_No. of ...' follow the answers of the question they are counted from
+    from utils.data_loader import load_questionnaire
+    questions = load_questionnaire()["questions"].tolist()
+    position = {question: i for i, question in enumerate(questions)}
+    first = {}
+    for i, question in enumerate(questions):
+        first.setdefault(question.split("_")[0], i)
+    key = lambda name: (first.get(name.split("_")[0], len(questions)), position.get(name, len(questions)), name)
+    return sorted(range(len(features)), key=lambda j: key(features[j]))
+
+
+def _aggregator(service):
+    with _aggregators_lock:
+        if service.model_hash not in _aggregators:
+            compiled = service.model.compiled
+            features = [feature["column"] for feature in compiled["features"]]
+            matrix = np.zeros((compiled["n_outputs"], len(features)))
+            for j, feature in enumerate(compiled["features"]):
+                if feature["kind"] == "onehot":
+                    matrix[list(feature["lookup"].values()), j] = 1.0
+                else:
+                    matrix[feature["position"], j] = 1.0
+            order = _questionnaire_order(features)   # Encoder order -> questionnaire order
+            _aggregators[service.model_hash] = ([features[j] for j in order], matrix[:, order])
+        return _aggregators[service.model_hash]
+
+
+def _contributions(service, encoded):
+    # TreeSHAP on encoded rows -> (n_profiles, n_classes, n_encoded_columns + 1); last column = bias
+    contribs = service.model.booster.predict(
+        xgb.DMatrix(encoded, missing=service.model.missing),
+        pred_contribs=True,
+        strict_shape=True,
+    )
+    features, matrix = _aggregator(service)
+    # Sum the encoded columns of each questionnaire feature, keep the bias as last column
+    return np.concatenate([contribs[:, :, :-1] @ matrix, contribs[:, :, -1:]], axis=2)
+
+
+def explain_profiles(service, profiles: pd.DataFrame):
+    """
+    Local SHAP values of many profiles in one TreeSHAP call.
+
+    Parameters:
+    - service: loaded ModelService
+    - profiles: DataFrame with one profile per row
+
+    Returns:
+    - (feature names + ['bias'], array of shape (n_profiles, n_classes, n_features + 1))
+    """
+    service.load()
+    encoded = service.model.transform(profiles)
+    features, _ = _aggregator(service)
+    return features + ["bias"], _contributions(service, encoded)
+
+
+def explain_profile(service, profile: pd.DataFrame) -> pd.DataFrame:
+    """
+    Local SHAP values of one profile, cached per model and (encoded) profile for all sessions.
+
+    Parameters:
+    - service: loaded ModelService
+    - profile: one-row DataFrame
+
+    Returns:
+    - DataFrame with a 'Question' column and one column per model class label
+      (margin units, without the bias), in questionnaire order (Q1, Q2, ...; derived counts next to their question)
+    """
+    service.load()
+    if service.fast is not None:
+        encoded = service.fast.encode(profile)
+    else:
+        encoded = service.model.transform(profile)
+    key = (service.model_hash, encoded.tobytes())
+
+    contribs = _explanations.get(key)
+    if contribs is None:
+        contribs = _contributions(service, encoded)
+        _explanations.put(key, contribs)
+
+    features, _ = _aggregator(service)
+    table = pd.DataFrame(contribs[0, :, :-1].T, columns=[str(c) for c in service.classes_])
+    table.insert(0, "Question", features)
+    return table
+
+
+def explanation_cache_stats() -> dict:
+    """
+    Hit/miss counters, hit rate and size of the explanation cache.
+    """
+    return _explanations.stats()
@@ -0,0 +1,263 @@
+from __future__ import annotations   # Type hints stay strings, so pd.DataFrame does not import pandas
+
+#---Import of modules and functions---#
+
+from utils.lazy_import import lazy_module
+
+np = lazy_module("numpy")
+pd = lazy_module("pandas")
+special = lazy_module("scipy.special")
+
+
+#---Fast path for single-profile inference---#
+#---The ColumnTransformer of a pipeline is compiled into plain dict lookups and the XGBoost booster is---#
+#---called directly on one NumPy row; no pandas and no sklearn validation per prediction.---#
+#---The lookups use the fitted categories themselves as keys, so they follow the same equality rules---#
+#---as the encoders (2 and 2.0 match an int category, the string '2' does not).---#
+
+class FastPathUnsupported(ValueError):
+    """
+    The pipeline contains a step the fast path cannot reproduce exactly.
+    """
+
+
+def _final_step(transformer):
+    # Encoders are wrapped in one-step pipelines in the trained models
+    if hasattr(transformer, "steps"):
+        if len(transformer.steps) != 1:
+            raise FastPathUnsupported(f"pipeline with {len(transformer.steps)} steps")
+        return transformer.steps[0][1]
+    return transformer
+
+
+def _plain_list(values) -> list:
+    # numpy arrays/scalars -> Python values, so JSON keeps the type (int stays int, str stays str)
+    return values.tolist() if hasattr(values, "tolist") else list(values)
+
+
+def preprocessing_spec(preprocessor) -> dict:
+    """
+    Declarative description of a fitted ColumnTransformer (OneHotEncoder/OrdinalEncoder blocks):
+    input column order, encoder assignment and the fitted categories of every column. JSON-serializable.
+
+    Returns:
+    - dict with 'input_columns' and 'transformers' (name, encoder, columns, categories, ...)
+    """
+    transformers = []
+    for name, transformer, columns in preprocessor.transformers_:
+        if name == "remainder" or transformer == "drop":
+            continue
+        encoder = _final_step(transformer)
+        encoder_type = type(encoder).__name__
+        entry = {"name": name, "columns": list(columns),
+                 "categories": [_plain_list(categories) for categories in encoder.categories_]}
+        if encoder_type == "OneHotEncoder":
+            if encoder.handle_unknown != "ignore" or getattr(encoder, "_infrequent_enabled", False):
+                raise FastPathUnsupported("OneHotEncoder needs handle_unknown='ignore' without infrequent categories")
+            drop_idx = encoder.drop_idx_ if encoder.drop_idx_ is not None else [None] * len(entry["columns"])
+            entry.update(encoder="onehot", drop=[None if d is None else int(d) for d in drop_idx])
+        elif encoder_type == "OrdinalEncoder":
+            if encoder.handle_unknown != "use_encoded_value":
+                raise FastPathUnsupported("OrdinalEncoder needs handle_unknown='use_encoded_value'")
+            entry.update(encoder="ordinal", unknown_value=float(encoder.unknown_value))
+        else:
+            raise FastPathUnsupported(f"transformer '{name}' ({encoder_type})")
+        transformers.append(entry)
+    return {"input_columns": _plain_list(preprocessor.feature_names_in_), "transformers": transformers}
+
+
+def compile_spec(spec: dict) -> dict:
+    """
+    Compile a preprocessing spec (see preprocessing_spec) into lookup tables.
+
+    Returns:
+    - dict with 'features' (one lookup table per input column) and 'n_outputs' (width of the encoded row)
+    """
+    features = []
+    offset = 0
+    for transformer in spec["transformers"]:
+        if transformer["encoder"] == "onehot":
+            for column, categories, dropped in zip(transformer["columns"], transformer["categories"], transformer["drop"]):
+                lookup = {}
+                for i, category in enumerate(categories):
+                    if i == dropped:
+                        continue   # Dropped category -> all zeros, same as an unknown value
+                    lookup[category] = offset
+                    offset += 1
+                features.append({"column": column, "kind": "onehot", "lookup": lookup})
+        else:
+            for column, categories in zip(transformer["columns"], transformer["categories"]):
+                features.append({
+                    "column": column,
+                    "kind": "ordinal",
+                    "position": offset,
+                    "lookup": {category: float(i) for i, category in enumerate(categories)},
+                    "unknown": transformer["unknown_value"],
+                })
+                offset += 1
+    return {"features": features, "n_outputs": offset}
+
+
+def compile_preprocessor(preprocessor) -> dict:
+    """
+    Compile a fitted ColumnTransformer (OneHotEncoder/OrdinalEncoder blocks) into lookup tables.
+
+    Returns:
+    - dict with 'features' (one lookup table per input column) and 'n_outputs' (width of the encoded row)
+    """
+    return compile_spec(preprocessing_spec(preprocessor))
+
+
+def _hashable(value) -> bool:
+    try:
+        hash(value)
+        return True
+    except TypeError:
+        return False
+
+
+def encode_frame(compiled: dict, df: pd.DataFrame, dtype=None) -> np.ndarray:
+    """
+    Encoded feature matrix of a DataFrame of profiles with compiled lookup tables (see compile_spec);
+    the same values the ColumnTransformer produces.
+
+    Parameters:
+    - compiled: dict with 'features' and 'n_outputs'
+    - df: profiles, one per row
+    - dtype: dtype of the matrix (default float64, like the ColumnTransformer)
+    """
+    X = np.zeros((len(df), compiled["n_outputs"]), dtype=dtype or np.float64)
+    rows = np.arange(len(df))
+    for feature in compiled["features"]:
+        lookup = feature["lookup"]
+        hits = np.array([lookup.get(value) if _hashable(value) else None
+                         for value in df[feature["column"]].tolist()], dtype=object)
+        known = hits != None   # noqa: E711 (element-wise comparison)
+        if feature["kind"] == "onehot":
+            X[rows[known], hits[known].astype(np.int64)] = 1
+        else:
+            X[:, feature["position"]] = np.where(known, hits, feature["unknown"]).astype(X.dtype)
+    return X
+
+
+class FastPredictor:
+    """
+    Single-profile predict_proba of a fitted Pipeline(preprocessing, XGBClassifier) or of its
+    native model (utils/model_format.py) without pandas or sklearn: compiled lookups + direct booster call.
+    Use verify_fast_predictor before relying on it.
+
+    Measured latency per profile (variant S, one core): about 0.5 ms for a dict and about 0.9 ms
+    for a one-row DataFrame, where extracting the row with .iloc costs the difference.
+    """
+
+    def __init__(self, model):
+        if hasattr(model, "spec"):   # NativeModel: booster + preprocessing spec
+            self.objective = model.spec["objective"]
+            compiled = model.compiled
+            self.classes_ = model.classes_
+            self.booster = model.booster
+            self.iteration_range = (0, 0)   # The native format has no early stopping
+            self.missing = model.missing
+        else:
+            preprocessor, classifier = model.steps[0][1], model.steps[-1][1]
+            if len(model.steps) != 2 or not hasattr(classifier, "get_booster"):
+                raise FastPathUnsupported("expected Pipeline(preprocessing, XGBClassifier)")
+            self.objective = classifier.get_params().get("objective")
+            compiled = compile_preprocessor(preprocessor)
+            self.classes_ = classifier.classes_
+            self.booster = classifier.get_booster()
+            self.iteration_range = classifier._get_iteration_range(None)
+            self.missing = classifier.missing
+        if self.objective not in ("multi:softmax", "multi:softprob", "binary:logistic"):
+            raise FastPathUnsupported(f"objective {self.objective}")
+
+        self.features = compiled["features"]
+        self.n_outputs = compiled["n_outputs"]
+        self.columns = [feature["column"] for feature in self.features]
+
+        # Encoded row of a profile whose every answer is unknown; ordinal slots hold unknown_value
+        self._template = np.zeros((1, self.n_outputs), dtype=np.float64)
+        for feature in self.features:
+            if feature["kind"] == "ordinal":
+                self._template[0, feature["position"]] = feature["unknown"]
+
+    def encode(self, profile) -> np.ndarray:
+        """
+        Encoded row (shape (1, n_outputs), float64) of one profile (dict, Series or one-row DataFrame).
+        """
+        if hasattr(profile, "columns"):
+            profile = profile.iloc[0]
+        if hasattr(profile, "index"):
+            profile = dict(zip(profile.index, profile.tolist()))   # Plain dict lookups are much cheaper than Series indexing
+        row = self._template.copy()
+        for feature in self.features:
+            value = profile[feature["column"]]
+            try:
+                hit = feature["lookup"].get(value)
+            except TypeError:   # Unhashable value -> unknown
+                hit = None
+            if hit is None:
+                continue
+            if feature["kind"] == "onehot":
+                row[0, hit] = 1.0
+            else:
+                row[0, feature["position"]] = hit
+        return row
+
+    def predict_proba(self, profile) -> np.ndarray:
+        """
+        Class probabilities of one profile, shape (1, n_classes), identical to model.predict_proba.
+        """
+        return self.predict_encoded(self.encode(profile))
+
+    def predict_encoded(self, row: np.ndarray) -> np.ndarray:
+        """
+        Class probabilities of an already encoded row (see encode).
+        """
+        if self.objective == "multi:softmax":
+            margin = self.booster.inplace_predict(
+                row, iteration_range=self.iteration_range, predict_type="margin",
+                missing=self.missing, validate_features=False,
+            )
+            return special.softmax(margin, axis=1)
+        proba = self.booster.inplace_predict(
+            row, iteration_range=self.iteration_range, predict_type="value",
+            missing=self.missing, validate_features=False,
+        )
+        if self.objective == "binary:logistic":
+            proba = np.vstack((1 - proba, proba)).T
+        return proba
+
+
+def validation_profiles(predictor: FastPredictor, defaults: pd.DataFrame, extra_values: dict = None) -> pd.DataFrame:
+    """
+    Profiles that cover every answer of every feature, in one frame the pipeline can score in one call:
+    per feature, the default profile with that feature set to each fitted category and each extra value
+    (e.g. from unique_with_rank); plus one profile in which every answer is unknown.
+
+    Returns:
+    - DataFrame with object columns (the answers keep their Python type, 2 is not turned into 2.0)
+    """
+    base = dict(zip(defaults.columns, defaults.iloc[0].tolist()))
+    records = [base]
+    for feature in predictor.features:
+        column = feature["column"]
+        values = list(feature["lookup"]) + list((extra_values or {}).get(column, []))
+        records.extend({**base, column: v} for v in values if not (isinstance(v, float) and np.isnan(v)))
+    records.append({column: "__unknown__" for column in base})
+
+    columns = {}
+    for column in base:
+        columns[column] = np.empty(len(records), dtype=object)
+        columns[column][:] = [record[column] for record in records]
+    return pd.DataFrame(columns)
+
+
+def verify_fast_predictor(predictor: FastPredictor, model, profiles: pd.DataFrame) -> bool:
+    """
+    True if the fast path returns exactly (bit for bit) the pipeline's probabilities for every profile.
+    Every profile is encoded on its own (as at prediction time), then all encoded rows are scored in
+    one booster call and compared with one pipeline call.
+    """
+    rows = [predictor.encode(profile) for profile in profiles.to_dict("records")]
+    return np.array_equal(predictor.predict_encoded(np.vstack(rows)), model.predict_proba(profiles))
@@ -0,0 +1,90 @@
+#---Import of modules and functions---#
+
+import ast
+import json
+import os
+import subprocess
+import sys
+
+
+#---Import-time budget per page: checks that pages only pay for the libraries they really use---#
+#---Run from the project folder:  python -m utils.import_budget---#
+
+BASE_PATH = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+# Libraries that must only be imported by a function that needs them
+HEAVY_MODULES = ("pandas", "numpy", "matplotlib", "seaborn", "scipy", "sklearn", "xgboost", "joblib")
+
+# Page -> import-time budget (milliseconds, on top of streamlit) and the heavy libraries it may import directly
+PAGE_BUDGETS = {
+    "RoleRecommender-app.py": {"max_ms": 100, "allowed_heavy": ()},
+    "pages/01_ Introduction.py": {"max_ms": 1500, "allowed_heavy": ("pandas", "numpy")},
+    "pages/02_Data Analysis and Visualization.py": {"max_ms": 100, "allowed_heavy": ()},
+    "pages/03_Machine Learing.py": {"max_ms": 100, "allowed_heavy": ()},
+    "pages/04_Your personal RoleRecommender.py": {"max_ms": 1500, "allowed_heavy": ("pandas", "numpy")},
+    "pages/05_How this App was built.py": {"max_ms": 100, "allowed_heavy": ()},
+    "pages/06_Download Center.py": {"max_ms": 100, "allowed_heavy": ()},
+}
+
+# Runs in a fresh interpreter: import streamlit first (always loaded in the server), then time the page's imports
+_PROBE = """
+import json, sys, time
+import streamlit
+start = time.perf_counter()
+exec(compile(sys.argv[1], "<page imports>", "exec"))
+elapsed_ms = (time.perf_counter() - start) * 1000
+heavy = sorted({name.split(".")[0] for name in sys.modules} & set(json.loads(sys.argv[2])))
+print(json.dumps({"ms": elapsed_ms, "heavy": heavy}))
+"""
+
+
+def page_imports(page_path: str) -> str:
+    """
+    Source of all top-level import statements of a page (everything else is not executed).
+    """
+    with open(page_path, "r", encoding="utf-8") as f:
+        source = f.read()
+    tree = ast.parse(source)
+    statements = [ast.get_source_segment(source, node) for node in tree.body
+                  if isinstance(node, (ast.Import, ast.ImportFrom))]
+    return "\n".join(statements)
+
+
+def measure_page(page: str) -> dict:
+    """
+    Import time (ms) and heavy libraries loaded by the imports of one page, in a fresh interpreter.
+    """
+    result = subprocess.run(
+        [sys.executable, "-c", _PROBE, page_imports(os.path.join(BASE_PATH, page)), json.dumps(HEAVY_MODULES)],
+        cwd=BASE_PATH, capture_output=True, text=True, check=True,
+    )
+    return json.loads(result.stdout.strip().splitlines()[-1])
+
+
+def check_import_budgets(budgets: dict = None) -> list:
+    """
+    Measure every page and compare it with its budget.
+
+    Returns:
+    - list of dicts (page, ms, max_ms, heavy, ok), one per page
+    """
+    results = []
+    for page, budget in (budgets or PAGE_BUDGETS).items():
+        measured = measure_page(page)
+        unexpected = [name for name in measured["heavy"] if name not in budget["allowed_heavy"]]
+        results.append({
+            "page": page,
+            "ms": round(measured["ms"], 1),
+            "max_ms": budget["max_ms"],
+            "heavy": measured["heavy"],
+            "ok": measured["ms"] <= budget["max_ms"] and not unexpected,
+        })
+    return results
+
+
+if __name__ == "__main__":
+    results = check_import_budgets()
+    for r in results:
+        status = "OK  " if r["ok"] else "FAIL"
+        print(f"{status} {r['ms']:>8.1f} ms / {r['max_ms']:>5} ms  {r['page']}  heavy={r['heavy']}")
+    sys.exit(0 if all(r["ok"] for r in results) else 1)
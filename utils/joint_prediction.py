@@ -0,0 +1,151 @@
+from __future__ import annotations   # Type hints stay strings, so pd.DataFrame does not import pandas
+
+#---Import of modules and functions---#
+
+import threading
+from utils.lazy_import import lazy_module
+from utils.model_loader import get_model_service
+from utils.prediction_cache import get_prediction, put_prediction
+from utils.variants import VARIANTS
+
+np = lazy_module("numpy")
+pd = lazy_module("pandas")
+
+
+#---Joint prediction: broad (L) and specific (S) role in one call---#
+#---The answers of a profile are looked up only once, into shared answer codes (one vocabulary per question,---#
+#---the union of the categories of all models). Each model's encoded matrix is then built from these codes---#
+#---with NumPy gathers, so the per-answer work is not repeated per model. The encoders of L and S differ---#
+#---slightly (e.g. one BI tool only exists in the L training data), which is why the shared step is the---#
+#---answer codes and not one encoded matrix.---#
+
+class SharedEncoder:
+    """
+    Answer codes shared by several models + per-model tables that turn codes into each model's encoded matrix.
+    """
+
+    def __init__(self, compiled_by_key: dict):
+        first = next(iter(compiled_by_key.values()))
+        self.columns = [feature["column"] for feature in first["features"]]
+
+        # Union vocabulary per question; code = position in the vocabulary, unknown = len(vocabulary)
+        self.vocabularies = []
+        for i, column in enumerate(self.columns):
+            vocabulary = {}
+            for compiled in compiled_by_key.values():
+                feature = compiled["features"][i]
+                if feature["column"] != column:
+                    raise ValueError("Models with different input columns cannot share an encoder")
+                for category in feature["lookup"]:
+                    vocabulary.setdefault(category, len(vocabulary))
+            self.vocabularies.append(vocabulary)
+
+        # Per model and question: code -> one-hot position (-1 = all zeros) or ordinal value
+        self.tables = {}
+        for key, compiled in compiled_by_key.items():
+            tables = []
+            for feature, vocabulary in zip(compiled["features"], self.vocabularies):
+                if feature["kind"] == "onehot":
+                    table = np.full(len(vocabulary) + 1, -1, dtype=np.int64)
+                else:
+                    table = np.full(len(vocabulary) + 1, feature["unknown"], dtype=np.float64)
+                for category, value in feature["lookup"].items():
+                    table[vocabulary[category]] = value
+                tables.append((feature, table))
+            self.tables[key] = (compiled["n_outputs"], tables)
+
+    def codes(self, df: pd.DataFrame) -> np.ndarray:
+        """
+        Answer codes (n_profiles, n_questions): the only step that looks at the raw answers.
+        """
+        codes = np.empty((len(df), len(self.columns)), dtype=np.int64)
+        if len(df) == 1:   # One profile (page 04): plain dict lookups are much cheaper than per-column Series access
+            row = dict(zip(df.columns, df.iloc[0].tolist()))
+            codes[0] = [_code(vocabulary, row[column], len(vocabulary))
+                        for column, vocabulary in zip(self.columns, self.vocabularies)]
+            return codes
+        for j, (column, vocabulary) in enumerate(zip(self.columns, self.vocabularies)):
+            unknown = len(vocabulary)
+            codes[:, j] = [_code(vocabulary, value, unknown) for value in df[column].tolist()]
+        return codes
+
+    def matrix(self, codes: np.ndarray, key: str) -> np.ndarray:
+        """
+        Encoded matrix of one model (float64, identical to its ColumnTransformer output) from shared codes.
+        """
+        n_outputs, tables = self.tables[key]
+        X = np.zeros((len(codes), n_outputs))
+        rows = np.arange(len(codes))
+        for j, (feature, table) in enumerate(tables):
+            mapped = table[codes[:, j]]
+            if feature["kind"] == "onehot":
+                hit = mapped >= 0
+                X[rows[hit], mapped[hit]] = 1.0
+            else:
+                X[:, feature["position"]] = mapped
+        return X
+
+
+def _code(vocabulary: dict, value, unknown: int) -> int:
+    try:
+        return vocabulary.get(value, unknown)
+    except TypeError:   # Unhashable value -> unknown
+        return unknown
+
+
+_encoders = {}   # model hashes -> SharedEncoder
+_encoders_lock = threading.Lock()
+
+
+def _shared_encoder(services: dict) -> SharedEncoder:
+    signature = tuple((key, service.model_hash) for key, service in services.items())
+    with _encoders_lock:
+        if signature not in _encoders:
+            _encoders[signature] = SharedEncoder(
+                {key: service.model.compiled for key, service in services.items()}
+            )
+        return _encoders[signature]
+
+
+def predict_joint(profiles: pd.DataFrame, keys=None) -> dict:
+    """
+    Class probabilities of all models for the same profiles, with the answers encoded only once.
+
+    Parameters:
+    - profiles: DataFrame with one profile per row (the common input columns of the models)
+    - keys: variants to predict, default: all (e.g. ('L', 'S'))
+
+    Returns:
+    - dict variant key -> probabilities (n_profiles, n_classes), identical to each model's predict_proba.
+      Single profiles use the shared prediction cache and fast path of the model services.
+    """
+    services = {key: get_model_service(key) for key in (keys or VARIANTS)}
+    encoder = _shared_encoder(services)
+    codes = encoder.codes(profiles)
+
+    results = {}
+    for key, service in services.items():
+        X = encoder.matrix(codes, key)
+        if len(X) != 1:
+            results[key] = service.model.predict_encoded(X)
+            continue
+        cache_key = (service.model_hash, X.tobytes())   # Same key as ModelService.predict_proba
+        proba = get_prediction(cache_key)
+        if proba is None:
+            proba = service.fast.predict_encoded(X) if service.fast is not None else service.model.predict_encoded(X)
+            put_prediction(cache_key, proba)
+        results[key] = proba
+    return results
+
+
+def predict_joint_frame(profiles: pd.DataFrame, keys=None) -> pd.DataFrame:
+    """
+    predict_joint as one DataFrame with a column per model and class, e.g. 'L: Data Science', 'S: Data Analyst'.
+    """
+    frames = []
+    for key, proba in predict_joint(profiles, keys).items():
+        class_names = {str(label): name for name, label in VARIANTS[key]["classes"].items()}
+        labels = get_model_service(key).classes_
+        columns = [f"{key}: {class_names.get(str(label), label)}" for label in labels]
+        frames.append(pd.DataFrame(proba, columns=columns, index=profiles.index))
+    return pd.concat(frames, axis=1)
@@ -0,0 +1,43 @@
+#---Import of modules and functions---#
+
+import importlib
+import threading
+
+
+#---Lazy module proxy: the real import happens on first attribute access---#
+#---Lets text-only pages import utils without paying for pandas, matplotlib, seaborn, scipy or joblib.---#
+
+class LazyModule:
+    """
+    Stand-in for a module that is imported on first use.
+
+    Example:
+        pd = LazyModule("pandas")   # nothing is imported yet
+        pd.DataFrame(...)           # pandas is imported here, once
+    """
+
+    def __init__(self, name: str):
+        self.__dict__["_name"] = name
+        self.__dict__["_module"] = None
+        self.__dict__["_lock"] = threading.Lock()
+
+    def _load(self):
+        if self._module is None:
+            with self._lock:
+                if self._module is None:
+                    self.__dict__["_module"] = importlib.import_module(self._name)
+        return self._module
+
+    def __getattr__(self, attr):
+        return getattr(self._load(), attr)
+
+    def __repr__(self):
+        state = "loaded" if self._module is not None else "not loaded"
+        return f"<lazy module '{self._name}' ({state})>"
+
+
+def lazy_module(name: str) -> LazyModule:
+    """
+    Return a proxy for the module `name` that imports it on first attribute access.
+    """
+    return LazyModule(name)
@@ -0,0 +1,179 @@
+#---Import of modules and functions---#
+
+import os
+import json
+import fnmatch
+from utils.artifact_cache import cached_load, content_hash
+from utils.lazy_import import lazy_module
+
+pd = lazy_module("pandas")
+np = lazy_module("numpy")
+joblib = lazy_module("joblib")
+
+
+#---Content-hashed manifest of everything in data/---#
+#---Records name, size, sha256, schema and producer step of every deployed artifact and checks it at startup.---#
+#---Models and response tables (GUARDED) are refused by their loaders if their sha256 does not match.---#
+#---The same sha256 (artifact_cache.content_hash) is the cache key of the loaders and all derived caches.---#
+#---Build step:  python -m utils.manifest---#
+
+DATA_PATH = os.path.join(os.path.dirname(os.path.dirname(__file__)), "data")
+MANIFEST_FILE = "manifest.json"
+
+# Not part of the manifest: derived caches and the manifest itself
+IGNORED = {MANIFEST_FILE, "_cache"}
+
+# File pattern -> step that produces the artifact (first match wins)
+PRODUCERS = [
+    ("questionnaire_bundle.json", "python -m utils.questionnaire_bundle"),
+    ("compiled_model_*.npz", "python -m utils.tree_evaluator"),
+    ("response_table_*.npz", "python -m utils.response_tables"),
+    ("model_*.ubj", "python -m utils.model_format"),
+    ("preprocessing_*.json", "python -m utils.model_format"),
+    ("Questionaire.xlsx", "Kaggle survey 2020 questionnaire (manual export)"),
+    ("pipe_xgb_*.pkl", "RoleRecommender notebook: model training"),
+    ("classification_report_*.json", "RoleRecommender notebook: model evaluation"),
+    ("confusion_matrix_*.json", "RoleRecommender notebook: model evaluation"),
+    ("shap_feature_importance_*.csv", "RoleRecommender notebook: SHAP analysis"),
+    ("*.csv", "RoleRecommender notebook: data preparation"),
+    ("*.json", "RoleRecommender notebook: data preparation"),
+    ("*.png", "project documentation (screenshots)"),
+    ("*.pdf", "project documentation (reports)"),
+]
+
+# Artifacts that are executed or served as predictions: loading them fails on a sha256 mismatch
+GUARDED = ("pipe_xgb_*.pkl", "model_*.ubj", "preprocessing_*.json", "compiled_model_*.npz", "response_table_*.npz")
+
+
+class ManifestMismatch(ValueError):
+    """
+    A guarded artifact in data/ differs from the one recorded in data/manifest.json.
+    """
+
+
+def producer_for(filename: str) -> str:
+    for pattern, producer in PRODUCERS:
+        if fnmatch.fnmatch(filename, pattern):
+            return producer
+    return "unknown"
+
+
+def describe_schema(path: str) -> dict:
+    """
+    Short description of the content of an artifact (columns/rows, keys, object type).
+    """
+    ext = os.path.splitext(path)[1].lower()
+    try:
+        if ext == ".csv":
+            sep = "," if path.endswith("kaggle_survey_2020_responses.csv") else ";"
+            df = pd.read_csv(path, sep=sep, encoding="utf-8-sig")
+            return {"format": "csv", "rows": int(df.shape[0]), "columns": int(df.shape[1])}
+        if ext == ".json":
+            with open(path, "r", encoding="utf-8-sig") as f:
+                content = json.load(f)
+            if isinstance(content, dict):
+                return {"format": "json", "type": "object", "keys": sorted(content)[:20]}
+            return {"format": "json", "type": "array", "length": len(content)}
+        if ext == ".pkl":
+            model = joblib.load(path)
+            return {"format": "pickle", "type": f"{type(model).__module__}.{type(model).__name__}"}
+        if ext == ".npz":
+            with np.load(path, allow_pickle=False) as data:
+                return {"format": "npz", "arrays": sorted(data.files)}
+        if ext == ".xlsx":
+            df = pd.read_excel(path, sheet_name=0, index_col=0)
+            return {"format": "xlsx", "rows": int(df.shape[0]), "columns": int(df.shape[1])}
+    except (ImportError, ValueError, OSError) as e:
+        return {"format": ext.lstrip("."), "error": f"{type(e).__name__}: {e}"}
+    return {"format": ext.lstrip(".")}
+
+
+def list_artifacts() -> list:
+    return sorted(name for name in os.listdir(DATA_PATH)
+                  if name not in IGNORED and not name.endswith(".tmp")
+                  and os.path.isfile(os.path.join(DATA_PATH, name)))
+
+
+def build_manifest(write: bool = True) -> dict:
+    """
+    Hash and describe every artifact in data/.
+
+    Returns:
+    - dict filename -> {size, sha256, schema, producer}
+    """
+    manifest = {}
+    for name in list_artifacts():
+        path = os.path.join(DATA_PATH, name)
+        manifest[name] = {
+            "size": os.path.getsize(path),
+            "sha256": content_hash(path),
+            "schema": describe_schema(path),
+            "producer": producer_for(name),
+        }
+    if write:
+        with open(os.path.join(DATA_PATH, MANIFEST_FILE), "w", encoding="utf-8") as f:
+            json.dump(manifest, f, ensure_ascii=False, indent=1)
+    return manifest
+
+
+def load_manifest() -> dict:
+    path = os.path.join(DATA_PATH, MANIFEST_FILE)
+
+    def read():
+        with open(path, "r", encoding="utf-8") as f:
+            return json.load(f)
+
+    return cached_load(path, read, copy=False)
+
+
+def verify_artifact(path: str):
+    """
+    Check a guarded artifact (model, native model, compiled model, response table) against the manifest
+    before it is loaded. Files outside data/ and setups without a manifest are not checked.
+
+    Raises:
+    - ManifestMismatch if the sha256 of the file differs from its manifest entry
+    """
+    name = os.path.basename(path)
+    if (os.path.dirname(os.path.abspath(path)) != os.path.abspath(DATA_PATH)
+            or not any(fnmatch.fnmatch(name, pattern) for pattern in GUARDED)):
+        return
+    try:
+        entry = load_manifest().get(name)
+    except (OSError, ValueError):
+        return
+    if entry is not None and content_hash(path) != entry["sha256"]:
+        raise ManifestMismatch(f"{name} does not match {MANIFEST_FILE} (sha256 {content_hash(path)[:12]}, "
+                               f"expected {entry['sha256'][:12]}); rebuild it with: {producer_for(name)}")
+
+
+def verify_manifest() -> list:
+    """
+    Compare data/ with the manifest (size and sha256 of every artifact).
+
+    Returns:
+    - list of problems, e.g. {'name': 'df_heat_L.csv', 'problem': 'sha256 mismatch'}; empty if all is fine
+    """
+    try:
+        manifest = load_manifest()
+    except (OSError, ValueError) as e:
+        return [{"name": MANIFEST_FILE, "problem": f"cannot read manifest ({e})"}]
+
+    problems = []
+    for name, entry in manifest.items():
+        path = os.path.join(DATA_PATH, name)
+        if not os.path.exists(path):
+            problems.append({"name": name, "problem": "missing"})
+        elif os.path.getsize(path) != entry["size"]:
+            problems.append({"name": name, "problem": "size mismatch"})
+        elif content_hash(path) != entry["sha256"]:
+            problems.append({"name": name, "problem": "sha256 mismatch"})
+    for name in list_artifacts():
+        if name not in manifest:
+            problems.append({"name": name, "problem": "not in manifest"})
+    return problems
+
+
+if __name__ == "__main__":
+    built = build_manifest(write=True)
+    print(f"Wrote {MANIFEST_FILE} with {len(built)} artifacts")
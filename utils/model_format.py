@@ -0,0 +1,220 @@
+from __future__ import annotations   # Type hints stay strings, so pd.DataFrame does not import pandas
+
+#---Import of modules and functions---#
+
+import hashlib
+import json
+import os
+import subprocess
+import sys
+import time
+from utils.artifact_cache import content_hash
+from utils.fast_inference import FastPredictor, compile_spec, encode_frame, preprocessing_spec, verify_fast_predictor
+from utils.manifest import verify_artifact
+from utils.lazy_import import lazy_module
+from utils.variants import DATA_PATH, VARIANTS
+
+np = lazy_module("numpy")
+pd = lazy_module("pandas")
+xgb = lazy_module("xgboost")
+special = lazy_module("scipy.special")
+
+
+#---Native model format: no pickles---#
+#---Every pipeline is stored as two files that are always read together:---#
+#---  data/model_<key>.ubj            the booster in XGBoost's binary UBJSON model format---#
+#---  data/preprocessing_<key>.json   declarative spec: column order, encoder assignment, fitted categories,---#
+#---                                  class labels and the sha256 of the booster file it belongs to---#
+#---Loading needs no scikit-learn, does not execute code from the files and does not depend on library---#
+#---versions of the training environment. Predictions are bit-identical to the pickled pipeline.---#
+#---The conversion also verifies the single-profile fast path (utils/fast_inference.py) bit for bit against---#
+#---the pickled pipeline and stores a digest of the checked spec; the app only uses fast paths with that digest.---#
+#---Conversion + benchmark:  python -m utils.model_format---#
+
+FORMAT = "rolerecommender-native-model"
+FORMAT_VERSION = 1
+
+
+def native_model_paths(key: str) -> tuple:
+    """
+    (booster path, spec path) of a variant.
+    """
+    return (os.path.join(DATA_PATH, f"model_{key}.ubj"), os.path.join(DATA_PATH, f"preprocessing_{key}.json"))
+
+
+def _pickle_path(key: str) -> str:
+    return os.path.join(DATA_PATH, VARIANTS[key]["files"]["model"])
+
+
+class NativeModel:
+    """
+    Booster + preprocessing spec with the interface of the pipeline (predict_proba, classes_, feature_names_in_).
+    """
+
+    missing = float("nan")   # Missing-value marker of the booster, as in XGBClassifier
+
+    def __init__(self, booster, spec: dict):
+        self.booster = booster
+        self.spec = spec
+        self.compiled = compile_spec(spec["preprocessing"])
+        self.classes_ = np.asarray(spec["classes"])
+        self.feature_names_in_ = np.asarray(spec["preprocessing"]["input_columns"], dtype=object)
+
+    def transform(self, df: pd.DataFrame) -> np.ndarray:
+        """
+        Encoded feature matrix, identical to the ColumnTransformer output.
+        """
+        return encode_frame(self.compiled, df)
+
+    def predict_proba(self, df: pd.DataFrame) -> np.ndarray:
+        """
+        Class probabilities (n_profiles, n_classes), computed like XGBClassifier.predict_proba.
+        """
+        return self.predict_encoded(self.transform(df))
+
+    def predict_encoded(self, X: np.ndarray) -> np.ndarray:
+        """
+        Class probabilities of an already encoded feature matrix (see transform).
+        """
+        if self.spec["objective"] == "multi:softmax":
+            margin = self.booster.inplace_predict(X, predict_type="margin", missing=np.nan, validate_features=False)
+            return special.softmax(margin, axis=1)
+        return self.booster.inplace_predict(X, predict_type="value", missing=np.nan, validate_features=False)
+
+
+def fast_path_digest(spec: dict) -> str:
+    """
+    Digest of everything the fast path depends on (booster, objective, classes, preprocessing).
+    """
+    checked = {name: spec[name] for name in ("booster_sha256", "objective", "classes", "preprocessing")}
+    return hashlib.sha256(json.dumps(checked, sort_keys=True, ensure_ascii=False).encode("utf-8")).hexdigest()
+
+
+def convert_model(key: str) -> tuple:
+    """
+    Convert the pickled pipeline of a variant into the native format (this is the only step that unpickles).
+    The fast path of the converted model is verified against the pipeline on validation_profiles;
+    only if it matches bit for bit, the spec gets 'fast_path_verified' (= fast_path_digest of the spec).
+
+    Returns:
+    - (booster path, spec path)
+    """
+    import joblib
+    model = joblib.load(_pickle_path(key))
+    preprocessor, classifier = model.steps[0][1], model.steps[-1][1]
+    objective = classifier.get_params().get("objective")
+    if objective not in ("multi:softmax", "multi:softprob"):
+        raise ValueError(f"Unsupported objective {objective}")
+    if classifier._get_iteration_range(None) != (0, 0):
+        raise ValueError("Pipelines with early stopping (best_iteration) are not supported")
+
+    booster_path, spec_path = native_model_paths(key)
+    raw = classifier.get_booster().save_raw("ubj")
+    spec = {
+        "format": FORMAT,
+        "version": FORMAT_VERSION,
+        "booster_file": os.path.basename(booster_path),
+        "booster_sha256": hashlib.sha256(raw).hexdigest(),
+        "source_sha256": content_hash(_pickle_path(key)),
+        "xgboost_version": xgb.__version__,
+        "objective": objective,
+        "classes": classifier.classes_.tolist(),
+        "n_outputs": int(classifier.n_features_in_),
+        "preprocessing": preprocessing_spec(preprocessor),
+    }
+
+    from utils.model_loader import fast_path_profiles
+    booster = xgb.Booster()
+    booster.load_model(bytearray(raw))
+    predictor = FastPredictor(NativeModel(booster, spec))
+    defaults = pd.read_csv(os.path.join(DATA_PATH, VARIANTS[key]["files"]["defaults"]), sep=';', encoding='utf-8-sig')
+    profiles = fast_path_profiles(predictor, defaults)
+    if verify_fast_predictor(predictor, model, profiles):
+        spec["fast_path_verified"] = fast_path_digest(spec)
+        spec["fast_path_profiles"] = len(profiles)
+
+    for path, write in ((booster_path, lambda f: f.write(raw)),
+                        (spec_path, lambda f: f.write(json.dumps(spec, ensure_ascii=False, indent=1).encode("utf-8")))):
+        tmp_path = f"{path}.{os.getpid()}.tmp"
+        with open(tmp_path, "wb") as f:
+            write(f)
+        os.replace(tmp_path, path)
+    return booster_path, spec_path
+
+
+def read_native_model(key: str) -> NativeModel:
+    """
+    Read booster and spec of a variant in one pass and check that they belong together.
+    """
+    booster_path, spec_path = native_model_paths(key)
+    verify_artifact(spec_path)
+    verify_artifact(booster_path)
+    with open(spec_path, "r", encoding="utf-8") as f:
+        spec = json.load(f)
+    with open(booster_path, "rb") as f:
+        raw = f.read()
+
+    if spec.get("format") != FORMAT or spec.get("version") != FORMAT_VERSION:
+        raise ValueError(f"{os.path.basename(spec_path)}: unsupported format {spec.get('format')} v{spec.get('version')}")
+    if hashlib.sha256(raw).hexdigest() != spec["booster_sha256"]:
+        raise ValueError(f"{os.path.basename(booster_path)} does not match {os.path.basename(spec_path)}")
+
+    booster = xgb.Booster()
+    booster.load_model(bytearray(raw))
+    return NativeModel(booster, spec)
+
+
+_COLD_PROBE = "import sys, time; start = time.perf_counter(); exec(sys.argv[1]); print(time.perf_counter() - start)"
+
+
+def _cold_seconds(statement: str) -> float:
+    # Import + load in a fresh interpreter, like a new worker process
+    result = subprocess.run([sys.executable, "-c", _COLD_PROBE, statement], cwd=os.path.dirname(DATA_PATH),
+                            capture_output=True, text=True, check=True)
+    return float(result.stdout.strip().splitlines()[-1])
+
+
+def benchmark_load(key: str, repeat: int = 5) -> dict:
+    """
+    Load time of the pickled pipeline (joblib.load) vs. the native format, best of `repeat` runs:
+    'warm' with all libraries already imported (deserialization only),
+    'cold' in a fresh interpreter (imports + deserialization).
+    """
+    import joblib
+    joblib.load(_pickle_path(key))
+    read_native_model(key)
+
+    def best(load):
+        times = []
+        for _ in range(repeat):
+            start = time.perf_counter()
+            load()
+            times.append(time.perf_counter() - start)
+        return min(times)
+
+    pickle_path = os.path.relpath(_pickle_path(key), os.path.dirname(DATA_PATH))
+    return {
+        "warm": {"joblib_seconds": best(lambda: joblib.load(_pickle_path(key))),
+                 "native_seconds": best(lambda: read_native_model(key))},
+        "cold": {"joblib_seconds": min(_cold_seconds(f"import joblib; joblib.load({pickle_path!r})")
+                                       for _ in range(repeat)),
+                 "native_seconds": min(_cold_seconds(f"from utils.model_format import read_native_model; "
+                                                     f"read_native_model({key!r})") for _ in range(repeat))},
+    }
+
+
+if __name__ == "__main__":
+    import joblib
+    from utils.manifest import build_manifest
+    converted = {key: convert_model(key) for key in VARIANTS}
+    print(f"Refreshed manifest.json ({len(build_manifest(write=True))} artifacts); "
+          f"rebuild the response tables next: python -m utils.response_tables")
+    for key, (booster_path, spec_path) in converted.items():
+        defaults = pd.read_csv(os.path.join(DATA_PATH, VARIANTS[key]["files"]["defaults"]), sep=';', encoding='utf-8-sig')
+        native = read_native_model(key)
+        identical = np.array_equal(native.predict_proba(defaults), joblib.load(_pickle_path(key)).predict_proba(defaults))
+        print(f"{key}: wrote {os.path.basename(booster_path)} + {os.path.basename(spec_path)}, identical predictions: {identical}, "
+              f"fast path verified: {'fast_path_verified' in native.spec}")
+        for mode, timing in benchmark_load(key).items():
+            print(f"   {mode}: native {timing['native_seconds'] * 1000:7.1f} ms   joblib.load {timing['joblib_seconds'] * 1000:7.1f} ms"
+                  f"   ({timing['joblib_seconds'] / timing['native_seconds']:.2f}x)")
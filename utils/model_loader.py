@@ -1,22 +1,41 @@
+from __future__ import annotations   # Type hints stay strings, so pd.DataFrame does not import pandas
+
 #---Import of modules and functions---#
 
-import pandas as pd
 import os
-import joblib
 import json
 import pickle
+import threading
+import time
+from utils.artifact_cache import cached_load, content_hash   # Process-wide cache for all artifacts in data/
+from utils.data_loader import load_unique_with_rank
+from utils.manifest import verify_artifact
+from utils.fast_inference import FastPathUnsupported, FastPredictor, validation_profiles
+from utils.prediction_cache import get_prediction, put_prediction
+from utils.lazy_import import lazy_module   # Heavy libraries are imported on first use
+
+pd = lazy_module("pandas")
+joblib = lazy_module("joblib")
 
 
 
 # --- Load models using joblib ---
 
+def load_pickled_model(model_path: str):
+    """
+    Unpickle a model after checking it against data/manifest.json (a mismatch raises ManifestMismatch).
+    """
+    verify_artifact(model_path)
+    return joblib.load(model_path)
+
+
 def load_model_L():
     """
     Load the XGBoost pipeline for general career path prediction (y_L).
     """
     base_path = os.path.dirname(os.path.dirname(__file__))
     model_path = os.path.join(base_path, "data", "pipe_xgb_L.pkl")
-    model = joblib.load(model_path)  # Load with joblib
+    model = cached_load(model_path, lambda: load_pickled_model(model_path))  # Load with joblib, once per process
     return model
 
 
@@ -26,10 +45,23 @@ def load_model_S():
     """
     base_path = os.path.dirname(os.path.dirname(__file__))
     model_path = os.path.join(base_path, "data", "pipe_xgb_S.pkl")
-    model = joblib.load(model_path)  # Load with joblib
+    model = cached_load(model_path, lambda: load_pickled_model(model_path))  # Load with joblib, once per process
     return model
 
 
+def load_native_model(key: str):
+    """
+    Load a model from the native format (booster in UBJSON + preprocessing spec, see utils/model_format.py)
+    instead of the pickle. Same predict_proba as the pipeline, bit for bit, without unpickling.
+
+    Parameters:
+    - key: variant key, e.g. 'L' or 'S'
+    """
+    from utils.model_format import native_model_paths, read_native_model
+    booster_path, spec_path = native_model_paths(key)
+    return cached_load([spec_path, booster_path], lambda: read_native_model(key), variant="native")
+
+
 # Load report for measuring model performance
 def load_classification_report_L(filename='classification_report_L.json'):
     """
@@ -37,8 +69,12 @@ def load_classification_report_L(filename='classification_report_L.json'):
     """
     base_path = os.path.dirname(os.path.dirname(__file__))
     report_path = os.path.join(base_path, "data", filename)
-    with open(report_path, "r") as f:
-        return json.load(f)
+
+    def read():
+        with open(report_path, "r") as f:
+            return json.load(f)
+
+    return cached_load(report_path, read)
 
 def load_classification_report_S(filename='classification_report_S.json'):
     """
@@ -46,8 +82,12 @@ def load_classification_report_S(filename='classification_report_S.json'):
     """
     base_path = os.path.dirname(os.path.dirname(__file__))
     report_path = os.path.join(base_path, "data", filename)
-    with open(report_path, "r") as f:
-        return json.load(f)
+
+    def read():
+        with open(report_path, "r") as f:
+            return json.load(f)
+
+    return cached_load(report_path, read)
     
 def load_confusion_matrix_L(filename='confusion_matrix_L.json'):
     """
@@ -55,8 +95,12 @@ def load_confusion_matrix_L(filename='confusion_matrix_L.json'):
     """
     base_path = os.path.dirname(os.path.dirname(__file__))
     report_path = os.path.join(base_path, "data", filename)
-    with open(report_path, "r") as f:
-        return json.load(f)
+
+    def read():
+        with open(report_path, "r") as f:
+            return json.load(f)
+
+    return cached_load(report_path, read)
     
 def load_confusion_matrix_S(filename='confusion_matrix_S.json'):
     """
@@ -64,8 +108,12 @@ def load_confusion_matrix_S(filename='confusion_matrix_S.json'):
     """
     base_path = os.path.dirname(os.path.dirname(__file__))
     report_path = os.path.join(base_path, "data", filename)
-    with open(report_path, "r") as f:
-        return json.load(f)
+
+    def read():
+        with open(report_path, "r") as f:
+            return json.load(f)
+
+    return cached_load(report_path, read)
 
 
 
@@ -76,4 +124,164 @@ def predict_proba(model, input_df: pd.DataFrame) -> pd.DataFrame:
     """
     probas = model.predict_proba(input_df)
     class_labels = model.classes_
-    return pd.DataFrame(probas, columns=class_labels)
\ No newline at end of file
+    return pd.DataFrame(probas, columns=class_labels)
+
+
+#---Model service: one warmed-up model per variant, shared by all Streamlit sessions of the process---#
+
+class ModelService:
+    """
+    Handle to one prediction model (variant 'L' or 'S' from utils/variants.py).
+
+    The model is loaded once from the native format (utils/model_format.py: UBJSON booster +
+    preprocessing spec, bit-identical to the pickled pipeline, nothing is unpickled) and warmed up
+    with a prediction on default_X_train_*, so no user request pays for the first-call
+    initialisation of XGBoost. After loading, the handle is read-only: predict_proba can be called
+    from many sessions at the same time (the encoders are plain lookups and XGBoost's in-place
+    prediction is thread-safe).
+
+    Single profiles are scored by the fast path (utils/fast_inference.py) if the conversion
+    step verified it bit for bit against the pickled pipeline on every answer of every feature, and their
+    results are shared across sessions through utils/prediction_cache.py.
+    The probabilities of the default profile (benchmark) are computed once at load time.
+    """
+
+    def __init__(self, key: str):
+        from utils.variants import VARIANTS, DATA_PATH   # utils.variants imports the data loaders
+        from utils.model_format import native_model_paths
+        files = VARIANTS[key]["files"]
+        self.key = key
+        self.pickle_path = os.path.join(DATA_PATH, files["model"])
+        self.model_path = native_model_paths(key)[1]   # The spec names its booster by sha256
+        self.defaults_path = os.path.join(DATA_PATH, files["defaults"])
+        self.model_hash = None
+        self.model = None
+        self.defaults = None
+        self.fast = None
+        self._benchmark_proba = None
+        self.timings = {"load_seconds": None, "warmup_seconds": None, "fast_path_seconds": None}
+        self._lock = threading.Lock()
+        self._ready = False
+
+    def load(self) -> "ModelService":
+        """
+        Load and warm up the model (only the first call does the work).
+        Raises ValueError if the native model was converted from another pickle than the deployed one.
+        """
+        if self._ready:
+            return self
+        with self._lock:
+            if self._ready:
+                return self
+            start = time.perf_counter()
+            self.model_hash = content_hash(self.model_path)
+            self.model = load_native_model(self.key)
+            if (os.path.exists(self.pickle_path)
+                    and content_hash(self.pickle_path) != self.model.spec["source_sha256"]):
+                raise ValueError(f"{os.path.basename(self.model_path)} was not converted from the current "
+                                 f"{os.path.basename(self.pickle_path)}; run: python -m utils.model_format")
+            self.defaults = cached_load(
+                self.defaults_path,
+                lambda: pd.read_csv(self.defaults_path, sep=';', encoding='utf-8-sig'),
+            )
+            self.timings["load_seconds"] = time.perf_counter() - start
+
+            start = time.perf_counter()
+            self._benchmark_proba = self.model.predict_proba(self.defaults)   # Warm-up = benchmark profile
+            self.timings["warmup_seconds"] = time.perf_counter() - start
+
+            start = time.perf_counter()
+            self.fast = _compile_fast_path(self.model)
+            self.timings["fast_path_seconds"] = time.perf_counter() - start
+            self._ready = True
+        return self
+
+    @property
+    def classes_(self):
+        return self.load().model.classes_
+
+    @property
+    def benchmark_proba(self):
+        """
+        Class probabilities of the default profile (default_X_train_*), pinned at load time.
+        """
+        return self.load()._benchmark_proba.copy()
+
+    def predict_proba(self, input_df: pd.DataFrame):
+        """
+        Class probabilities (numpy array, one row per profile, columns in the order of classes_).
+        Single profiles are served from the prediction cache if possible.
+        """
+        self.load()
+        if len(input_df) != 1:
+            return self.model.predict_proba(input_df)
+
+        # Canonical key: the encoded feature row, as the model sees it
+        if self.fast is not None:
+            row = self.fast.encode(input_df)
+        else:
+            row = self.model.transform(input_df)
+        key = (self.model_hash, row.tobytes())
+
+        proba = get_prediction(key)
+        if proba is None:
+            proba = self.fast.predict_encoded(row) if self.fast is not None else self.model.predict_proba(input_df)
+            put_prediction(key, proba)
+        return proba
+
+    def status(self) -> dict:
+        return {"key": self.key, "ready": self._ready, "model_hash": self.model_hash,
+                "fast_path": self.fast is not None, **self.timings}
+
+
+def fast_path_profiles(predictor: FastPredictor, defaults: pd.DataFrame) -> pd.DataFrame:
+    """
+    Validation profiles of the fast path: every fitted category and every answer page 04 offers, per feature.
+    """
+    rank_df = load_unique_with_rank()
+    extra_values = {column: [v for v in rank_df[column] if pd.notnull(v)] for column in rank_df.columns}
+    return validation_profiles(predictor, defaults, extra_values)
+
+
+def _compile_fast_path(model):
+    # Fast path only if the conversion step (model_format.convert_model) verified it bit for bit against
+    # the pickled pipeline; the digest ties that check to this booster and preprocessing spec
+    from utils.model_format import fast_path_digest
+    if model.spec.get("fast_path_verified") != fast_path_digest(model.spec):
+        return None
+    try:
+        return FastPredictor(model)
+    except (FastPathUnsupported, KeyError):
+        return None
+
+
+_services = {}
+_services_lock = threading.Lock()
+
+
+def get_model_service(key: str) -> ModelService:
+    """
+    The process-wide, warmed-up model service of a variant.
+    A new service is created only when the native model changed on disk.
+
+    Parameters:
+    - key: variant key from utils/variants.py, e.g. 'L' or 'S'
+
+    Returns:
+    - loaded ModelService
+    """
+    with _services_lock:
+        service = _services.get(key)
+        if service is None or (service.model_hash is not None
+                               and service.model_hash != content_hash(service.model_path)):
+            service = ModelService(key)
+            _services[key] = service
+    return service.load()
+
+
+def model_service_status() -> dict:
+    """
+    Load and warm-up timings (seconds) of every model service created so far.
+    """
+    with _services_lock:
+        return {key: service.status() for key, service in _services.items()}
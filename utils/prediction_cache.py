@@ -0,0 +1,135 @@
+#---Import of modules and functions---#
+
+import os
+import threading
+import time
+from collections import OrderedDict
+
+
+#---Process-wide cache of prediction results, shared by all Streamlit sessions---#
+#---Key: (model hash, canonical encoding of the profile). The canonical encoding is the encoded---#
+#---feature row, so answers that the model cannot tell apart (e.g. 2 and 2.0) share one entry.---#
+#---Other per-profile results (e.g. SHAP explanations) use their own ResultCache instance, so they---#
+#---neither compete for the slots of the predictions nor skew their hit rate.---#
+
+DEFAULT_MAX_ENTRIES = int(os.environ.get("ROLERECOMMENDER_PREDICTION_CACHE_SIZE", 4096))
+DEFAULT_TTL_SECONDS = float(os.environ.get("ROLERECOMMENDER_PREDICTION_CACHE_TTL", 3600))
+
+
+class ResultCache:
+    """
+    Thread-safe LRU cache of NumPy results with a time to live and hit/miss counters.
+    """
+
+    def __init__(self, max_entries: int = DEFAULT_MAX_ENTRIES, ttl_seconds: float = DEFAULT_TTL_SECONDS):
+        self._lock = threading.Lock()
+        self._entries = OrderedDict()     # key -> (expires_at, result), ordered from least to most recently used
+        self._max_entries = max_entries
+        self._ttl_seconds = ttl_seconds
+        self._stats = {"hits": 0, "misses": 0, "expired": 0, "evictions": 0}
+
+    def get(self, key):
+        """
+        Cached result for key, or None on a miss (unknown or expired entry).
+        The returned array is a copy, so callers can modify it.
+        """
+        now = time.monotonic()
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is not None and entry[0] < now:
+                del self._entries[key]
+                self._stats["expired"] += 1
+                entry = None
+            if entry is None:
+                self._stats["misses"] += 1
+                return None
+            self._entries.move_to_end(key)
+            self._stats["hits"] += 1
+            return entry[1].copy()
+
+    def put(self, key, result):
+        """
+        Store result for key and evict the least recently used entries above the size limit.
+        """
+        with self._lock:
+            self._entries[key] = (time.monotonic() + self._ttl_seconds, result.copy())
+            self._entries.move_to_end(key)
+            self._evict()
+
+    def _evict(self):
+        while len(self._entries) > self._max_entries:
+            self._entries.popitem(last=False)
+            self._stats["evictions"] += 1
+
+    def configure(self, max_entries: int = None, ttl_seconds: float = None):
+        """
+        Change the size limit and/or the time to live (seconds).
+        """
+        with self._lock:
+            if max_entries is not None:
+                self._max_entries = max_entries
+            if ttl_seconds is not None:
+                self._ttl_seconds = ttl_seconds
+            self._evict()
+
+    def clear(self):
+        """
+        Remove all cached results and reset the counters.
+        """
+        with self._lock:
+            self._entries.clear()
+            for name in self._stats:
+                self._stats[name] = 0
+
+    def stats(self) -> dict:
+        """
+        Hit/miss counters, hit rate and size.
+        """
+        with self._lock:
+            lookups = self._stats["hits"] + self._stats["misses"]
+            return {
+                **self._stats,
+                "hit_rate": self._stats["hits"] / lookups if lookups else 0.0,
+                "entries": len(self._entries),
+                "max_entries": self._max_entries,
+                "ttl_seconds": self._ttl_seconds,
+            }
+
+
+_predictions = ResultCache()
+
+
+def get_prediction(key):
+    """
+    Cached probabilities for key, or None on a miss (unknown or expired entry).
+    The returned array is a copy, so callers can modify it.
+    """
+    return _predictions.get(key)
+
+
+def put_prediction(key, probabilities):
+    """
+    Store probabilities for key and evict the least recently used entries above the size limit.
+    """
+    _predictions.put(key, probabilities)
+
+
+def configure_prediction_cache(max_entries: int = None, ttl_seconds: float = None):
+    """
+    Change the size limit and/or the time to live (seconds) of the prediction cache.
+    """
+    _predictions.configure(max_entries, ttl_seconds)
+
+
+def clear_prediction_cache():
+    """
+    Remove all cached predictions and reset the counters.
+    """
+    _predictions.clear()
+
+
+def prediction_cache_stats() -> dict:
+    """
+    Hit/miss counters, hit rate and size of the prediction cache.
+    """
+    return _predictions.stats()
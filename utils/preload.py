@@ -0,0 +1,116 @@
+#---Import of modules and functions---#
+
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+from utils import data_loader, model_loader, response_tables, statistic_functions, variants
+from utils.manifest import verify_manifest
+
+
+#---Warm-up of all artifacts the pages use, so the first visitor is as fast as the hundredth---#
+#---Every loader publishes its result into the process-wide artifact cache (utils/artifact_cache.py).---#
+
+# Name -> loader call, in the order the pages need them
+PRELOAD_ARTIFACTS = {
+    "df_heat_L (shared)": lambda: data_loader.load_df_heat_L(shared=True),
+    "df_heat_S (shared)": lambda: data_loader.load_df_heat_S(shared=True),
+    "target_associations_L": lambda: statistic_functions.load_target_associations("L"),
+    "target_associations_S": lambda: statistic_functions.load_target_associations("S"),
+    "cramers_v_matrix_L": lambda: statistic_functions.load_cramers_v_matrix("L", workers=1),
+    "cramers_v_matrix_S": lambda: statistic_functions.load_cramers_v_matrix("S", workers=1),
+    "question_long_short": data_loader.load_question_long_short,
+    "unique_with_rank": data_loader.load_unique_with_rank,
+    "unique_values_per_feature_L": data_loader.load_unique_values_per_feature_L,
+    "unique_values_per_feature_S": data_loader.load_unique_values_per_feature_S,
+    "shap_feature_importance_L": data_loader.load_shap_feature_importance_all_classes_L,
+    "shap_feature_importance_S": data_loader.load_shap_feature_importance_all_classes_S,
+    "default_X_train_L": data_loader.load_default_X_train_L,
+    "default_X_train_S": data_loader.load_default_X_train_S,
+    "df_long (compact)": lambda: data_loader.load_df_long(compact=True),
+    "questionnaire": data_loader.load_questionnaire,
+    "model_service_L (warm-up)": lambda: model_loader.get_model_service("L"),
+    "model_service_S (warm-up)": lambda: model_loader.get_model_service("S"),
+    "response_table_L": lambda: response_tables.load_response_table("L"),
+    "response_table_S": lambda: response_tables.load_response_table("S"),
+    "classification_report_L": model_loader.load_classification_report_L,
+    "classification_report_S": model_loader.load_classification_report_S,
+    "confusion_matrix_L": model_loader.load_confusion_matrix_L,
+    "confusion_matrix_S": model_loader.load_confusion_matrix_S,
+    "variant_L": lambda: variants.load_variant("L"),
+    "variant_S": lambda: variants.load_variant("S"),
+}
+
+_lock = threading.Lock()
+_ready = threading.Event()
+_started = False
+_status = {"timings": {}, "errors": {}, "total_seconds": None, "manifest_problems": None}
+
+
+def _timed_load(name, loader):
+    start = time.perf_counter()
+    try:
+        loader()
+    except Exception as e:   # e.g. optional files like df_long.csv that are not deployed
+        _status["errors"][name] = f"{type(e).__name__}: {e}"
+    _status["timings"][name] = time.perf_counter() - start
+
+
+def _check_manifest():
+    # Integrity check of data/ against data/manifest.json; also fills the content-hash memo
+    try:
+        _status["manifest_problems"] = verify_manifest()
+    except Exception as e:
+        _status["manifest_problems"] = [{"name": "manifest.json", "problem": f"{type(e).__name__}: {e}"}]
+
+
+def _run_preload(max_workers):
+    start = time.perf_counter()
+    with ThreadPoolExecutor(max_workers=max_workers, thread_name_prefix="preload") as pool:
+        pool.submit(_check_manifest)
+        for name, loader in PRELOAD_ARTIFACTS.items():
+            pool.submit(_timed_load, name, loader)
+    _status["total_seconds"] = time.perf_counter() - start
+    _ready.set()
+
+
+def start_preload(max_workers: int = 8) -> bool:
+    """
+    Start loading all artifacts concurrently in the background (once per process).
+    Safe to call on every rerun: only the first call starts the warm-up.
+
+    Returns:
+    - True if this call started the warm-up, False if it was already running or done
+    """
+    global _started
+    with _lock:
+        if _started:
+            return False
+        _started = True
+    threading.Thread(target=_run_preload, args=(max_workers,), name="preload", daemon=True).start()
+    return True
+
+
+def wait_until_ready(timeout: float = None) -> bool:
+    """
+    Block until the warm-up has finished (or the timeout expired). Returns the readiness flag.
+    """
+    return _ready.wait(timeout)
+
+
+def is_ready() -> bool:
+    return _ready.is_set()
+
+
+def preload_status() -> dict:
+    """
+    Readiness flag, per-artifact load times (seconds), any load errors
+    and the result of the manifest integrity check (None until it ran).
+    """
+    return {
+        "ready": _ready.is_set(),
+        "timings": dict(_status["timings"]),
+        "errors": dict(_status["errors"]),
+        "total_seconds": _status["total_seconds"],
+        "manifest_problems": _status["manifest_problems"],
+    }
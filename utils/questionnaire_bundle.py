@@ -0,0 +1,159 @@
+from __future__ import annotations   # Type hints stay strings, so pd.DataFrame does not import pandas
+
+#---Import of modules and functions---#
+
+import os
+import json
+import hashlib
+from utils.artifact_cache import cached_load, content_hash
+from utils.columnar_cache import CACHE_DIR
+from utils.lazy_import import lazy_module
+
+pd = lazy_module("pandas")
+
+
+#---Pre-compiled questionnaire bundle---#
+#---Questionaire.xlsx and the small lookup files are compiled once into one JSON file with a version hash,---#
+#---so the app never has to parse Excel (and never needs openpyxl) unless the questionnaire really changed.---#
+#---A stale bundle is rebuilt at runtime into data/_cache; the tracked data/questionnaire_bundle.json is only---#
+#---written by the build step, which also refreshes the manifest:  python -m utils.questionnaire_bundle---#
+
+DATA_PATH = os.path.join(os.path.dirname(os.path.dirname(__file__)), "data")
+BUNDLE_FILE = "questionnaire_bundle.json"
+
+# Bundle section -> source file in data/
+SOURCES = {
+    "questionnaire": "Questionaire.xlsx",
+    "question_long_short": "question_long_short.csv",
+    "unique_with_rank": "unique_with_rank.csv",
+    "categories": "categories.json",
+    "encoder_assignment": "encoder_assignment.csv",
+}
+
+
+def _bundle_paths() -> tuple:
+    # (tracked build artifact, runtime rebuild in the ignored cache directory)
+    return os.path.join(DATA_PATH, BUNDLE_FILE), os.path.join(CACHE_DIR, BUNDLE_FILE)
+
+
+def _source_paths() -> list:
+    return [os.path.join(DATA_PATH, filename) for filename in SOURCES.values()]
+
+
+def source_hashes() -> dict:
+    """
+    sha256 of every source file of the bundle.
+    """
+    return {filename: content_hash(os.path.join(DATA_PATH, filename)) for filename in SOURCES.values()}
+
+
+def bundle_version(hashes: dict) -> str:
+    """
+    Version hash of the bundle: one hash over the hashes of all sources.
+    """
+    digest = hashlib.sha256()
+    for filename in sorted(hashes):
+        digest.update(f"{filename}:{hashes[filename]}\n".encode("utf-8"))
+    return digest.hexdigest()
+
+
+def _frame_to_json(df: pd.DataFrame) -> dict:
+    # orient='split' keeps column order; to_json turns NaN into null
+    return json.loads(df.to_json(orient="split", force_ascii=False))
+
+
+def _frame_from_json(section: dict) -> pd.DataFrame:
+    df = pd.DataFrame(section["data"], columns=section["columns"], index=section["index"])
+    df.index.name = section.get("index_name")
+    return df
+
+
+def build_questionnaire_bundle(write: bool = True, path: str = None) -> dict:
+    """
+    Compile all questionnaire sources into one bundle (the only place that reads the Excel file).
+
+    Parameters:
+    - write: also write the bundle to `path`
+    - path: target file (default: data/questionnaire_bundle.json)
+
+    Returns:
+    - the bundle as a dict
+    """
+    source = lambda name: os.path.join(DATA_PATH, SOURCES[name])
+
+    questionnaire = pd.read_excel(source("questionnaire"), sheet_name=0, index_col=0)
+    # Same raw table the old loader used: no header, row 0 = long texts, row 1 = short texts
+    question_long_short = pd.read_csv(source("question_long_short"), sep=';', header=None)
+    unique_with_rank = pd.read_csv(source("unique_with_rank"), sep=';')
+    with open(source("categories"), "r", encoding="utf-8-sig") as f:
+        categories = json.load(f)
+    encoder_assignment = pd.read_csv(source("encoder_assignment"), sep=';', encoding='utf-8-sig')
+
+    hashes = source_hashes()
+    questionnaire_json = _frame_to_json(questionnaire)
+    questionnaire_json["index_name"] = questionnaire.index.name
+    bundle = {
+        "version": bundle_version(hashes),
+        "sources": hashes,
+        "questionnaire": questionnaire_json,
+        "question_long_short": question_long_short.values.tolist(),
+        "unique_with_rank": _frame_to_json(unique_with_rank),
+        "categories": categories,
+        "encoder_assignment": _frame_to_json(encoder_assignment),
+    }
+
+    if write:
+        bundle_path = path or _bundle_paths()[0]
+        tmp_path = f"{bundle_path}.{os.getpid()}.tmp"
+        with open(tmp_path, "w", encoding="utf-8") as f:
+            json.dump(bundle, f, ensure_ascii=False, indent=1)
+        os.replace(tmp_path, bundle_path)
+    return bundle
+
+
+def _read_bundle() -> dict:
+    # The tracked bundle, else the runtime rebuild, as long as it was built from the current sources
+    # (content hash, not timestamp); otherwise rebuild into data/_cache, never over the tracked file
+    hashes = source_hashes()
+    bundle = None
+    for bundle_path in _bundle_paths():
+        try:
+            with open(bundle_path, "r", encoding="utf-8") as f:
+                candidate = json.load(f)
+        except (OSError, ValueError):
+            continue
+        if candidate.get("sources") == hashes:
+            bundle = candidate
+            break
+
+    if bundle is None:
+        try:
+            os.makedirs(CACHE_DIR, exist_ok=True)
+            bundle = build_questionnaire_bundle(write=True, path=_bundle_paths()[1])
+        except OSError:
+            bundle = build_questionnaire_bundle(write=False)   # Read-only deployment
+
+    return {
+        "version": bundle["version"],
+        "questionnaire": _frame_from_json(bundle["questionnaire"]),
+        "question_long_short": bundle["question_long_short"],
+        "unique_with_rank": _frame_from_json(bundle["unique_with_rank"]),
+        "categories": bundle["categories"],
+        "encoder_assignment": _frame_from_json(bundle["encoder_assignment"]),
+    }
+
+
+def load_questionnaire_bundle() -> dict:
+    """
+    The decoded bundle (DataFrames and lists), held once per process.
+    Re-validated whenever the bundle or one of its source files changes on disk.
+    """
+    paths = _source_paths() + [path for path in _bundle_paths() if os.path.exists(path)]
+    return cached_load(paths, _read_bundle, variant="bundle", copy=False)
+
+
+if __name__ == "__main__":
+    from utils.manifest import build_manifest
+    built = build_questionnaire_bundle(write=True)
+    print(f"Wrote {BUNDLE_FILE} (version {built['version'][:12]})")
+    print(f"Refreshed manifest.json ({len(build_manifest(write=True))} artifacts)")
@@ -0,0 +1,166 @@
+from __future__ import annotations   # Type hints stay strings, so pd.DataFrame does not import pandas
+
+#---Import of modules and functions---#
+
+import time
+from utils.lazy_import import lazy_module
+
+pd = lazy_module("pandas")
+
+
+#---"What should my next step be?" - what-if analysis on top of a model service---#
+
+def _class_index(model, class_label) -> int:
+    # Model class labels are compared as strings (see page 04)
+    return [str(c) for c in model.classes_].index(str(class_label))
+
+
+def _current_rank(options: list, value):
+    try:
+        return options.index(value)
+    except ValueError:
+        return None
+
+
+def next_best_actions(model, profile: pd.DataFrame, features: list, options: dict, class_label) -> pd.DataFrame:
+    """
+    Score every single-answer change of the given features in one batched predict_proba call.
+
+    Parameters:
+    - model: fitted pipeline or ModelService (anything with predict_proba and classes_)
+    - profile: current profile (one-row DataFrame)
+    - features: features that may change, e.g. the top-N SHAP features
+    - options: feature -> answers in rank order (from unique_with_rank.csv)
+    - class_label: model class label of the target role, e.g. '1'
+
+    Returns:
+    - DataFrame (Feature, Current answer, New answer, Steps, Role score (%), Gain (pp)),
+      sorted by gain; Steps = change of the rank in unique_with_rank (e.g. +1 = one level up)
+    """
+    base = profile.iloc[0].to_dict()
+    rows = [base]   # Row 0 = the current profile, so the same call also gives the current score
+    changes = []
+    for feature in features:
+        answers = options.get(feature, [])
+        current = base.get(feature)
+        current_rank = _current_rank(answers, current)
+        for rank, answer in enumerate(answers):
+            if answer == current:
+                continue
+            rows.append({**base, feature: answer})
+            changes.append({
+                "Feature": feature,
+                "Current answer": current,
+                "New answer": answer,
+                "Steps": rank - current_rank if current_rank is not None else None,
+            })
+
+    columns = ["Feature", "Current answer", "New answer", "Steps", "Role score (%)", "Gain (pp)"]
+    if not changes:
+        return pd.DataFrame(columns=columns)
+
+    proba = model.predict_proba(pd.DataFrame(rows, columns=profile.columns))
+    scores = proba[:, _class_index(model, class_label)] * 100
+
+    table = pd.DataFrame(changes)
+    table["Role score (%)"] = scores[1:]
+    table["Gain (pp)"] = scores[1:] - scores[0]
+    return table.sort_values("Gain (pp)", ascending=False, kind="stable").reset_index(drop=True)[columns]
+
+
+#---Multi-step career path: cheapest sequence of one-rank-up moves that reaches a target score---#
+
+def _profile_rows(base: dict, features: list, options: dict, states: list) -> list:
+    # State = tuple of answer ranks, one per feature
+    return [{**base, **{f: options[f][r] for f, r in zip(features, state)}} for state in states]
+
+
+def optimize_career_path(model, profile: pd.DataFrame, features: list, options: dict, class_label,
+                         target_score: float, beam_width: int = 8, max_steps: int = 8,
+                         time_budget: float = 1.0) -> dict:
+    """
+    Beam search for the shortest sequence of ordinal steps (one answer one rank up in
+    unique_with_rank.csv, e.g. Q6 '3-5 years' -> '5-10 years') that lifts the role score
+    to target_score. Each search level is scored in one batched predict_proba call,
+    and every visited profile is scored only once.
+
+    Parameters:
+    - model: fitted pipeline or ModelService
+    - profile: current profile (one-row DataFrame)
+    - features: features that may move, e.g. the top-N SHAP features
+    - options: feature -> answers in rank order (from unique_with_rank.csv)
+    - class_label: model class label of the target role
+    - target_score: role score to reach (percent)
+    - beam_width: profiles kept per level
+    - max_steps: longest path that is searched
+    - time_budget: seconds after which the best path found so far is returned
+
+    Returns:
+    - dict with 'reached', 'start_score', 'final_score', 'path' (DataFrame: Step, Feature, From, To,
+      Role score (%)), 'evaluated' (profiles scored) and 'seconds'
+    """
+    start = time.perf_counter()
+    base = profile.iloc[0].to_dict()
+    class_idx = _class_index(model, class_label)
+
+    # Only features whose current answer has a rank can move
+    features = [f for f in features if _current_rank(options.get(f, []), base.get(f)) is not None]
+    start_state = tuple(_current_rank(options[f], base[f]) for f in features)
+
+    scores = {}   # Memo: state -> role score (%)
+
+    def evaluate(states):
+        new = [s for s in states if s not in scores]
+        if new:
+            proba = model.predict_proba(pd.DataFrame(_profile_rows(base, features, options, new), columns=profile.columns))
+            scores.update(zip(new, proba[:, class_idx] * 100))
+
+    evaluate([start_state])
+    parents = {start_state: None}   # State -> (previous state, index of the moved feature)
+    best = start_state
+    frontier = [start_state]
+
+    for _ in range(max_steps):
+        if scores[best] >= target_score or time.perf_counter() - start > time_budget:
+            break
+        successors = []
+        for state in frontier:
+            for i, rank in enumerate(state):
+                if rank + 1 < len(options[features[i]]):
+                    successor = state[:i] + (rank + 1,) + state[i + 1:]
+                    if successor not in parents:
+                        parents[successor] = (state, i)
+                        successors.append(successor)
+        if not successors:
+            break
+        evaluate(successors)
+        frontier = sorted(successors, key=scores.get, reverse=True)[:beam_width]
+        reached = [s for s in frontier if scores[s] >= target_score]
+        if reached:
+            best = reached[0]
+        elif scores[frontier[0]] > scores[best]:
+            best = frontier[0]
+
+    # Walk back from the best state to the start
+    steps = []
+    state = best
+    while parents[state] is not None:
+        previous, i = parents[state]
+        steps.append({
+            "Feature": features[i],
+            "From": options[features[i]][previous[i]],
+            "To": options[features[i]][state[i]],
+            "Role score (%)": scores[state],
+        })
+        state = previous
+    path = pd.DataFrame(steps[::-1], columns=["Feature", "From", "To", "Role score (%)"])
+    path.insert(0, "Step", range(1, len(path) + 1))
+
+    return {
+        "reached": scores[best] >= target_score,
+        "start_score": scores[start_state],
+        "final_score": scores[best],
+        "path": path,
+        "evaluated": len(scores),
+        "seconds": time.perf_counter() - start,
+    }
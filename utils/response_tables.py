@@ -0,0 +1,286 @@
+from __future__ import annotations   # Type hints stay strings, so pd.DataFrame does not import pandas
+
+#---Import of modules and functions---#
+
+import itertools
+import json
+import os
+import sys
+from utils.artifact_cache import cached_load, content_hash
+from utils.columnar_cache import CACHE_DIR
+from utils.joint_prediction import predict_joint
+from utils.lazy_import import lazy_module
+from utils.manifest import verify_artifact
+from utils.model_loader import get_model_service
+from utils.variants import DATA_PATH, VARIANTS
+
+np = lazy_module("numpy")
+pd = lazy_module("pandas")
+
+
+#---Precomputed model responses around the default profile (partial-dependence lookup tables)---#
+#---Every answer a model knows is a fitted category of its encoder, so all profiles that differ from the---#
+#---default profile in one feature, or in a pair of top features, can be enumerated and scored ahead of---#
+#---time in one batched predict_proba call. data/response_table_<key>.npz holds these probabilities plus---#
+#---the hash of the model and default profile they were computed with. Page 04 reads role scores and---#
+#---what-if grids from the table and only runs the model for profiles the table does not cover.---#
+#---A stale table (other model or default profile) is rebuilt at runtime into data/_cache; the tracked---#
+#---files in data/ are only written by the build step:  python -m utils.response_tables---#
+
+FORMAT_VERSION = 1
+TOP_PAIR_FEATURES = 10   # Per class, = the most top features page 04 lets you choose
+
+
+def response_table_path(key: str) -> str:
+    return os.path.join(DATA_PATH, f"response_table_{key}.npz")
+
+
+def _rebuilt_table_path(key: str) -> str:
+    # Runtime rebuilds go to the ignored cache directory, never over the tracked (manifest-checked) file
+    return os.path.join(CACHE_DIR, os.path.basename(response_table_path(key)))
+
+
+def top_pair_features(key: str, n_features: int = TOP_PAIR_FEATURES) -> list:
+    """
+    Union of the top-n SHAP features of every class of a variant (the features page 04 offers as top features).
+    """
+    from utils.data_loader import load_question_long_short, load_unique_with_rank
+    from utils.variants import load_variant
+
+    shap_df = load_variant(key)["shap"]
+    shap_df = shap_df.assign(Question=shap_df["Question"].map(load_question_long_short()).fillna(shap_df["Question"]))
+    shap_df = shap_df[shap_df["Question"].isin(load_unique_with_rank().columns)]
+    features = set()
+    for category in VARIANTS[key]["classes"]:
+        features.update(shap_df.sort_values(by=category, ascending=False)["Question"].iloc[:n_features])
+    return sorted(features)
+
+
+def build_response_table(key: str, path: str = None) -> str:
+    """
+    Score all single-feature and top-pair variations of the default profile of a variant and
+    write them to `path` (default: data/response_table_<key>.npz).
+
+    Returns:
+    - path of the written file
+    """
+    service = get_model_service(key)
+    defaults = service.defaults
+    spec = service.model.spec["preprocessing"]
+    categories = {}
+    for transformer in spec["transformers"]:
+        categories.update(zip(transformer["columns"], transformer["categories"]))
+    columns = [column for column in spec["input_columns"] if column in categories]
+
+    # Row layout: 0 = default profile, then one block per feature, then one grid per pair (row-major)
+    features, offset = [], 1
+    for column in columns:
+        features.append({"column": column, "values": categories[column], "offset": offset})
+        offset += len(categories[column])
+    position = {column: i for i, column in enumerate(columns)}
+    top = sorted((column for column in top_pair_features(key) if column in position), key=position.get)
+    pairs = []
+    for a, b in itertools.combinations(top, 2):
+        pairs.append({"columns": [a, b], "offset": offset})
+        offset += len(categories[a]) * len(categories[b])
+
+    data = {column: np.full(offset, defaults.at[0, column], dtype=object) for column in defaults.columns}
+    for feature in features:
+        data[feature["column"]][feature["offset"]:feature["offset"] + len(feature["values"])] = feature["values"]
+    for pair in pairs:
+        a, b = pair["columns"]
+        values_a, values_b = np.asarray(categories[a], dtype=object), np.asarray(categories[b], dtype=object)
+        end = pair["offset"] + len(values_a) * len(values_b)
+        data[a][pair["offset"]:end] = np.repeat(values_a, len(values_b))
+        data[b][pair["offset"]:end] = np.tile(values_b, len(values_a))
+    profiles = pd.DataFrame(data).astype(defaults.dtypes.to_dict())
+
+    proba = service.model.predict_proba(profiles)
+    table_spec = {
+        "version": FORMAT_VERSION,
+        "model_sha256": service.model_hash,
+        "defaults_sha256": content_hash(service.defaults_path),
+        "classes": service.classes_.tolist(),
+        "features": features,
+        "pairs": pairs,
+    }
+
+    path = path or response_table_path(key)
+    tmp_path = f"{path}.{os.getpid()}.tmp.npz"
+    np.savez_compressed(tmp_path, spec=np.array(json.dumps(table_spec, ensure_ascii=False)), proba=proba)
+    os.replace(tmp_path, path)
+    return path
+
+
+class ResponseTable:
+    """
+    Lookup table of class probabilities for profiles that differ from the default profile
+    in at most one feature, or in one of the precomputed feature pairs.
+    """
+
+    def __init__(self, path: str):
+        with np.load(path, allow_pickle=False) as data:
+            self.spec = json.loads(str(data["spec"]))
+            self.proba = data["proba"]
+        self.classes_ = np.asarray(self.spec["classes"])
+        self.features = {feature["column"]: feature for feature in self.spec["features"]}
+        self.codes = {feature["column"]: {value: i for i, value in enumerate(feature["values"])}
+                      for feature in self.spec["features"]}
+        self.pairs = {tuple(pair["columns"]): pair["offset"] for pair in self.spec["pairs"]}
+        self.default_codes = None   # Set by load_response_table from the default profile
+
+    def _code(self, column: str, value):
+        try:
+            return self.codes[column].get(value)
+        except TypeError:   # Unhashable value
+            return None
+
+    def _profile_codes(self, profile: pd.DataFrame):
+        row = dict(zip(profile.columns, profile.iloc[0].tolist()))
+        codes = {column: self._code(column, row.get(column)) for column in self.features}
+        return None if None in codes.values() else codes
+
+    def changed_features(self, profile: pd.DataFrame):
+        """
+        Features in which a one-row profile differs from the default profile (in table order),
+        or None if the profile has an answer the table does not know.
+        """
+        codes = self._profile_codes(profile)
+        if codes is None:
+            return None
+        return [(column, code) for column, code in codes.items() if code != self.default_codes[column]]
+
+    def lookup(self, profile: pd.DataFrame):
+        """
+        Class probabilities (1, n_classes) of a one-row profile, or None if the table does not cover it.
+        """
+        changed = self.changed_features(profile)
+        if changed is None or len(changed) > 2:
+            return None
+        if not changed:
+            row = 0
+        elif len(changed) == 1:
+            column, code = changed[0]
+            row = self.features[column]["offset"] + code
+        else:
+            (a, code_a), (b, code_b) = changed
+            if (a, b) not in self.pairs:
+                return None
+            row = self.pairs[(a, b)] + code_a * len(self.features[b]["values"]) + code_b
+        return self.proba[row:row + 1].copy()
+
+    def pair_grid(self, profile: pd.DataFrame, feature_a: str, values_a: list, feature_b: str, values_b: list):
+        """
+        Class probabilities (len(values_a), len(values_b), n_classes) of the profile with feature_a and feature_b
+        set to every combination of values, or None if the table does not cover it.
+        """
+        changed = self.changed_features(profile)
+        if changed is None or any(column not in (feature_a, feature_b) for column, _ in changed):
+            return None
+        swap = (feature_b, feature_a) in self.pairs
+        if not swap and (feature_a, feature_b) not in self.pairs:
+            return None
+        codes_a = [self._code(feature_a, value) for value in values_a]
+        codes_b = [self._code(feature_b, value) for value in values_b]
+        if None in codes_a or None in codes_b:
+            return None
+
+        first, second = (feature_b, feature_a) if swap else (feature_a, feature_b)
+        grid = self.proba[self.pairs[(first, second)]:][:len(self.features[first]["values"]) *
+                                                         len(self.features[second]["values"])]
+        grid = grid.reshape(len(self.features[first]["values"]), len(self.features[second]["values"]), -1)
+        if swap:
+            grid = grid.transpose(1, 0, 2)
+        return grid[np.ix_(codes_a, codes_b)]
+
+
+def load_response_table(key: str):
+    """
+    The response table of a variant, held once per process: the tracked file in data/ if it was
+    computed with the current model and default profile, otherwise a rebuilt copy in data/_cache
+    (built first if it is missing or stale as well).
+    """
+    service = get_model_service(key)
+
+    def is_current(table):
+        return (table.spec.get("version") == FORMAT_VERSION and table.spec["model_sha256"] == service.model_hash
+                and table.spec["defaults_sha256"] == content_hash(service.defaults_path))
+
+    def reader(path):
+        def read():
+            verify_artifact(path)   # Only checks the tracked file in data/
+            table = ResponseTable(path)
+            table.default_codes = table._profile_codes(service.defaults)
+            return table
+        return read
+
+    for path in (response_table_path(key), _rebuilt_table_path(key)):
+        if os.path.exists(path):
+            table = cached_load(path, reader(path))
+            if is_current(table):
+                return table
+
+    path = _rebuilt_table_path(key)
+    os.makedirs(CACHE_DIR, exist_ok=True)
+    build_response_table(key, path)
+    return cached_load(path, reader(path))
+
+
+def predict_with_tables(profile, keys=None) -> dict:
+    """
+    Class probabilities of a one-row profile for all variants: from the response tables where they
+    cover the profile, from one joint model call (utils/joint_prediction.py) for the rest.
+
+    Parameters:
+    - profile: one-row DataFrame used for every variant, or dict variant key -> one-row DataFrame
+      (e.g. the same answers on top of each variant's own default profile)
+    - keys: variants to predict if profile is a DataFrame, default: all
+
+    Returns:
+    - dict variant key -> probabilities (1, n_classes)
+    """
+    profiles = dict(profile) if isinstance(profile, dict) else dict.fromkeys(keys or VARIANTS, profile)
+    results = {}
+    for key, variant_profile in profiles.items():
+        proba = load_response_table(key).lookup(variant_profile)
+        if proba is not None:
+            results[key] = proba
+
+    # Variants with identical profiles share one joint model call
+    groups = []
+    for key in (key for key in profiles if key not in results):
+        group = next((group for group in groups if profiles[group[0]].equals(profiles[key])), None)
+        if group is None:
+            groups.append([key])
+        else:
+            group.append(key)
+    for group in groups:
+        results.update(predict_joint(profiles[group[0]], group))
+    return {key: results[key] for key in profiles}
+
+
+def what_if_grid(key: str, profile: pd.DataFrame, feature_a: str, values_a: list, feature_b: str, values_b: list):
+    """
+    Class probabilities of a one-row profile with two features set to every combination of values.
+
+    Returns:
+    - array (len(values_a), len(values_b), n_classes); from the response table if it covers the profile,
+      otherwise scored in one batched model call
+    """
+    grid = load_response_table(key).pair_grid(profile, feature_a, values_a, feature_b, values_b)
+    if grid is not None:
+        return grid
+    profiles = pd.concat([profile] * (len(values_a) * len(values_b)), ignore_index=True)
+    profiles[feature_a] = np.repeat(np.asarray(values_a, dtype=object), len(values_b))
+    profiles[feature_b] = np.tile(np.asarray(values_b, dtype=object), len(values_a))
+    profiles = profiles.astype(profile.dtypes.to_dict())
+    return get_model_service(key).predict_proba(profiles).reshape(len(values_a), len(values_b), -1)
+
+
+if __name__ == "__main__":
+    for key in VARIANTS:
+        written = build_response_table(key)
+        table = ResponseTable(written)
+        print(f"Wrote {os.path.basename(written)}: {len(table.proba)} profiles, {len(table.pairs)} feature pairs "
+              f"({os.path.getsize(written) / 1024:.0f} KB)")
+    sys.exit(0)
@@ -0,0 +1,115 @@
+from __future__ import annotations   # Type hints stay strings, so pd.DataFrame does not import pandas
+
+#---Import of modules and functions---#
+
+import os
+import json
+import shutil
+from utils.columnar_cache import CACHE_DIR, code_dtype
+from utils.lazy_import import lazy_module
+
+np = lazy_module("numpy")
+pd = lazy_module("pandas")
+
+
+#---Read-only, memory-mapped store for the encoded survey datasets---#
+#---Every Streamlit process on the host maps the same files, so the OS page cache holds the data only once.---#
+
+STORE_DIR = os.path.join(CACHE_DIR, "shared")
+STORE_VERSION = 1
+
+
+def _store_path(name: str, source_token: str) -> str:
+    # One directory per dataset version, e.g. data/_cache/shared/df_heat_L-3f1c9a0b2d4e5f60
+    return os.path.join(STORE_DIR, f"{name}-{source_token}")
+
+
+def publish_dataset(name: str, df: pd.DataFrame, source_token: str) -> str:
+    """
+    Write a compact (categorical) DataFrame into the shared store.
+
+    The codes of all columns go into one (n_columns x n_rows) .npy matrix,
+    so each column is a contiguous row that can be mapped without copying.
+    Vocabularies and column names go into meta.json.
+
+    Parameters:
+    - name: dataset name, e.g. 'df_heat_L'
+    - df: DataFrame whose columns are all Categoricals (see compact_frame)
+    - source_token: version of the source file the data was derived from
+
+    Returns:
+    - path of the published store directory
+    """
+    target = _store_path(name, source_token)
+    if os.path.exists(os.path.join(target, "meta.json")):
+        return target
+
+    categories = [df[col].cat.categories.tolist() for col in df.columns]
+    dtype = code_dtype(max(len(c) for c in categories))
+    codes = np.empty((df.shape[1], df.shape[0]), dtype=dtype)
+    for i, col in enumerate(df.columns):
+        codes[i] = df[col].cat.codes.to_numpy()
+
+    meta = {
+        "version": STORE_VERSION,
+        "columns": list(df.columns),
+        # .item() turns NumPy scalars into plain Python values for JSON
+        "categories": [[c.item() if hasattr(c, "item") else c for c in cats] for cats in categories],
+    }
+
+    # Build in a private directory, then rename it into place in one step
+    os.makedirs(STORE_DIR, exist_ok=True)
+    tmp_dir = f"{target}.{os.getpid()}.tmp"
+    os.makedirs(tmp_dir, exist_ok=True)
+    np.save(os.path.join(tmp_dir, "codes.npy"), codes)
+    with open(os.path.join(tmp_dir, "meta.json"), "w", encoding="utf-8") as f:
+        json.dump(meta, f, ensure_ascii=False)
+    try:
+        os.rename(tmp_dir, target)
+    except OSError:
+        # Another process published the same version first
+        shutil.rmtree(tmp_dir, ignore_errors=True)
+
+    _remove_old_versions(name, keep=target)
+    return target
+
+
+def _remove_old_versions(name: str, keep: str):
+    # Best effort: processes that still map an old version keep working on Linux
+    for entry in os.listdir(STORE_DIR):
+        path = os.path.join(STORE_DIR, entry)
+        if entry.startswith(f"{name}-") and path != keep and not entry.endswith(".tmp"):
+            shutil.rmtree(path, ignore_errors=True)
+
+
+def attach_dataset(name: str, source_token: str):
+    """
+    Attach to a published dataset without copying it into process memory.
+
+    Returns:
+    - DataFrame of Categoricals whose codes are read-only views on the mapped file,
+      or None if this version has not been published yet
+    """
+    target = _store_path(name, source_token)
+    try:
+        with open(os.path.join(target, "meta.json"), "r", encoding="utf-8") as f:
+            meta = json.load(f)
+        codes = np.load(os.path.join(target, "codes.npy"), mmap_mode="r")
+    except (OSError, ValueError):
+        return None
+    if meta.get("version") != STORE_VERSION:
+        return None
+
+    data = {
+        col: pd.Categorical.from_codes(codes[i], categories=meta["categories"][i], validate=False)
+        for i, col in enumerate(meta["columns"])
+    }
+    # copy=False keeps the codes as views on the memory map
+    return pd.DataFrame(data, columns=meta["columns"], copy=False)
+
+
+def is_shared(df: pd.DataFrame) -> bool:
+    """
+    True if all columns of the DataFrame are backed by a memory-mapped store.
+    """
+    return all(isinstance(df[col].array.codes, np.memmap) for col in df.columns)
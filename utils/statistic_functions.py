@@ -1,6 +1,11 @@
-import pandas as pd
-import numpy as np
-from scipy.stats import chi2_contingency
+from __future__ import annotations   # Type hints stay strings, so pd.DataFrame does not import pandas
+
+import os
+from utils.lazy_import import lazy_module
+
+pd = lazy_module("pandas")
+np = lazy_module("numpy")
+stats = lazy_module("scipy.stats")   # chi2_contingency, imported on first test
 
 def test_chisquare(dframe: pd.DataFrame, x: int, y: int) -> dict:
     """
@@ -20,8 +25,12 @@ def test_chisquare(dframe: pd.DataFrame, x: int, y: int) -> dict:
     # Create contingency table between the two categorical columns
     contingency_table = pd.crosstab(dframe[ordinate_col_name], dframe[abscissa_col_name])
 
+    # Compact (categorical) frames keep unobserved answers as all-zero rows/columns; drop them
+    contingency_table = contingency_table.loc[contingency_table.sum(axis=1) > 0,
+                                              contingency_table.sum(axis=0) > 0]
+
     # Perform Chi-Square test
-    chi2, p, dof, expected = chi2_contingency(contingency_table)
+    chi2, p, dof, expected = stats.chi2_contingency(contingency_table)
 
     # Calculate Cramér's V effect size
     n = contingency_table.values.sum()
@@ -33,5 +42,553 @@ def test_chisquare(dframe: pd.DataFrame, x: int, y: int) -> dict:
         "p-value": p,
         "Degrees of Freedom": dof,
         "Cramers V": cramers_v,
+        "Cramers V (bias-corrected)": float(_cramers_v_batch(contingency_table.values[None])[1][0]),
         "Contingency Table": contingency_table
     }
+
+
+#---Cramér's V of many contingency tables at once (resampling, see below)---#
+
+def _cramers_v_batch(counts: np.ndarray):
+    """
+    Cramér's V (as test_chisquare, with Yates' correction for 2x2 tables) and the bias-corrected
+    Cramér's V (Bergsma 2013) of a stack of count tables (n_tables, n_rows, n_columns).
+    All-zero rows/columns (e.g. answers missing from a resample) are left out per table.
+    """
+    counts = np.asarray(counts, dtype=np.float64)
+    n = counts.sum(axis=(1, 2))
+    row_sums, column_sums = counts.sum(axis=2), counts.sum(axis=1)
+    expected = row_sums[:, :, None] * column_sums[:, None, :] / n[:, None, None]
+    r, c = (row_sums > 0).sum(axis=1), (column_sums > 0).sum(axis=1)
+    dof = (r - 1) * (c - 1)
+
+    with np.errstate(divide="ignore", invalid="ignore"):
+        deviation = np.abs(counts - expected)
+        corrected = np.where((dof == 1)[:, None, None], np.maximum(deviation - 0.5, 0.0), deviation)
+        safe_expected = np.where(expected > 0, expected, 1.0)
+        chi2 = np.where(expected > 0, corrected ** 2 / safe_expected, 0.0).sum(axis=(1, 2))
+        chi2_raw = np.where(expected > 0, deviation ** 2 / safe_expected, 0.0).sum(axis=(1, 2))
+
+        min_dim = np.minimum(r, c) - 1
+        cramers_v = np.where(min_dim > 0, np.sqrt(chi2 / (n * min_dim)), np.nan)
+
+        # Bias correction: phi² minus its expectation under independence, with shrunk table dimensions
+        phi2 = np.maximum(0.0, chi2_raw / n - dof / (n - 1))
+        r_corrected = r - (r - 1) ** 2 / (n - 1)
+        c_corrected = c - (c - 1) ** 2 / (n - 1)
+        min_corrected = np.minimum(r_corrected, c_corrected) - 1
+        cramers_v_corrected = np.where(min_dim > 0, np.sqrt(phi2 / min_corrected), np.nan)
+    return cramers_v, cramers_v_corrected
+
+
+#---Vectorized Chi-Square tests of all features against one target column---#
+#---Every column is turned into integer codes; the contingency tables of all features are counted---#
+#---with one np.bincount over combined codes (feature offset + x code * n_target + target code).---#
+
+def _category_codes(series: pd.Series):
+    """
+    Integer codes (int64, -1 = missing) and number of levels of a column; compact (categorical) columns keep their codes.
+    """
+    if isinstance(series.dtype, pd.CategoricalDtype):
+        return series.cat.codes.to_numpy().astype(np.int64), len(series.cat.categories)
+    codes, levels = pd.factorize(series)
+    return codes.astype(np.int64), len(levels)
+
+
+def _chisquare_from_counts(table: np.ndarray) -> dict:
+    # Same statistic as scipy.stats.chi2_contingency (incl. Yates' correction for 2x2 tables) on a count matrix
+    table = table[table.sum(axis=1) > 0][:, table.sum(axis=0) > 0]
+    n = table.sum()
+    expected = np.outer(table.sum(axis=1), table.sum(axis=0)) / n
+    dof = (table.shape[0] - 1) * (table.shape[1] - 1)
+    observed = table.astype(np.float64)
+    if dof == 0:
+        return {"Chi2 Statistic": 0.0, "p-value": 1.0, "Degrees of Freedom": 0, "Cramers V": np.nan,
+                "Cramers V (bias-corrected)": np.nan}
+    if dof == 1:
+        diff = expected - observed
+        observed = observed + np.sign(diff) * np.minimum(0.5, np.abs(diff))
+    chi2 = float(((observed - expected) ** 2 / expected).sum())
+    min_dim = min(table.shape) - 1
+    return {
+        "Chi2 Statistic": chi2,
+        "p-value": float(stats.chi2.sf(chi2, dof)),
+        "Degrees of Freedom": dof,
+        "Cramers V": float(np.sqrt(chi2 / (n * min_dim))),
+        "Cramers V (bias-corrected)": float(_cramers_v_batch(table[None])[1][0]),
+    }
+
+
+def _chisquare_against(x: np.ndarray, levels, target_codes: np.ndarray, n_target: int) -> list:
+    # Chi-Square results of every column of the code matrix x (n_rows, n_features) against one target
+    sizes = np.asarray(levels, dtype=np.int64) * n_target
+    offsets = np.concatenate([[0], np.cumsum(sizes)[:-1]]).astype(np.int64)   # One disjoint range per feature
+    combined = offsets + x * n_target + target_codes[:, None]
+    valid = (x >= 0) & (target_codes >= 0)[:, None]   # Missing answers are left out, like pd.crosstab
+    counts = np.bincount(combined[valid], minlength=int(sizes.sum()))
+    return [
+        _chisquare_from_counts(counts[offset:offset + size].reshape(-1, n_target))
+        for offset, size in zip(offsets, sizes)
+    ]
+
+
+def test_chisquare_all(dframe: pd.DataFrame, y: int) -> pd.DataFrame:
+    """
+    Chi-Square test and Cramér's V of every column against one target column, in one pass.
+
+    Parameters:
+    - dframe: input DataFrame (compact/categorical or plain)
+    - y: integer index of the target column (ordinate)
+
+    Returns:
+    - DataFrame indexed by column name with Chi2 Statistic, p-value, Degrees of Freedom and Cramers V
+      (the values test_chisquare returns for each column), in column order
+    """
+    target_codes, n_target = _category_codes(dframe.iloc[:, y])
+    columns = [column for i, column in enumerate(dframe.columns) if i != y]
+    codes, levels = zip(*(_category_codes(dframe[column]) for column in columns))
+    results = _chisquare_against(np.column_stack(codes), levels, target_codes, n_target)
+    return pd.DataFrame(results, index=pd.Index(columns, name="Question"))
+
+
+def load_target_associations(key: str, y: int = 2) -> pd.DataFrame:
+    """
+    test_chisquare_all of df_heat_<key> against its role column, computed once per dataset version (content hash).
+
+    Parameters:
+    - key: variant key, e.g. 'L' or 'S'
+    - y: integer index of the target column (default: 2, the role)
+    """
+    from utils.artifact_cache import cached_load
+    from utils.data_loader import load_shared_dataset
+    from utils.variants import DATA_PATH, VARIANTS
+
+    data_path = os.path.join(DATA_PATH, VARIANTS[key]["files"]["df_heat"])
+    return cached_load(data_path, lambda: test_chisquare_all(load_shared_dataset(data_path), y),
+                       variant=f"chisquare_all_y{y}")
+
+
+#---Pairwise Cramér's V of all features (redundancy between questionnaire answers)---#
+#---Row i of the upper triangle (feature i against all later features) is one task for a worker process;---#
+#---each task counts its contingency tables with one np.bincount (see _chisquare_against).---#
+#---The matrix is stored in data/_cache/<dataset>_cramers_v.npz and rebuilt when the CSV content changes.---#
+
+CRAMERS_V_VERSION = 1
+_worker_codes = None   # (code matrix, levels) of the worker process, set by _init_cramers_v_worker
+
+
+def _init_cramers_v_worker(x, levels):
+    global _worker_codes
+    _worker_codes = (x, levels)
+
+
+def _cramers_v_row(i: int) -> list:
+    x, levels = _worker_codes
+    results = _chisquare_against(x[:, i + 1:], levels[i + 1:], x[:, i], levels[i])
+    return [result["Cramers V"] for result in results]
+
+
+def cramers_v_matrix(dframe: pd.DataFrame, workers: int = None) -> pd.DataFrame:
+    """
+    Symmetric matrix of Cramér's V between all columns (same values as test_chisquare for each pair).
+
+    Parameters:
+    - dframe: input DataFrame (compact/categorical or plain)
+    - workers: worker processes; default: all cores. 1 computes in this process.
+
+    Returns:
+    - DataFrame (n_columns x n_columns) with 1.0 on the diagonal
+    """
+    from concurrent.futures import ProcessPoolExecutor
+
+    codes, levels = zip(*(_category_codes(dframe[column]) for column in dframe.columns))
+    x, levels = np.column_stack(codes), list(levels)
+    n_columns = len(levels)
+    workers = workers or os.cpu_count() or 1
+
+    if workers == 1:
+        _init_cramers_v_worker(x, levels)
+        rows = [_cramers_v_row(i) for i in range(n_columns - 1)]
+    else:
+        with ProcessPoolExecutor(max_workers=workers, initializer=_init_cramers_v_worker,
+                                 initargs=(x, levels)) as pool:
+            rows = list(pool.map(_cramers_v_row, range(n_columns - 1)))
+
+    matrix = np.eye(n_columns)
+    for i, row in enumerate(rows):
+        matrix[i, i + 1:] = row
+        matrix[i + 1:, i] = row
+    return pd.DataFrame(matrix, index=dframe.columns, columns=dframe.columns)
+
+
+def load_cramers_v_matrix(key: str, workers: int = None) -> pd.DataFrame:
+    """
+    cramers_v_matrix of df_heat_<key>, built once per dataset version and stored next to the columnar cache.
+
+    Parameters:
+    - key: variant key, e.g. 'L' or 'S'
+    - workers: worker processes for a rebuild (default: all cores)
+    """
+    from utils.artifact_cache import cached_load, file_fingerprint
+    from utils.columnar_cache import cache_path_for
+    from utils.data_loader import load_shared_dataset
+    from utils.variants import DATA_PATH, VARIANTS
+
+    data_path = os.path.join(DATA_PATH, VARIANTS[key]["files"]["df_heat"])
+    cache_path = cache_path_for(data_path, "_cramers_v.npz")
+
+    def read():
+        source = file_fingerprint(data_path)   # Content hash of the CSV
+        try:
+            with np.load(cache_path, allow_pickle=False) as arrays:
+                if int(arrays["__version__"]) == CRAMERS_V_VERSION and str(arrays["__source__"]) == source:
+                    columns = arrays["columns"].tolist()
+                    return pd.DataFrame(arrays["matrix"], index=columns, columns=columns)
+        except (OSError, KeyError, ValueError):
+            pass
+
+        matrix = cramers_v_matrix(load_shared_dataset(data_path), workers)
+        try:
+            os.makedirs(os.path.dirname(cache_path), exist_ok=True)
+            tmp_path = f"{cache_path}.{os.getpid()}.tmp"
+            with open(tmp_path, "wb") as f:
+                np.savez(f, matrix=matrix.to_numpy(), columns=np.array(matrix.columns, dtype=str),
+                         __version__=np.array(CRAMERS_V_VERSION), __source__=np.array(source))
+            os.replace(tmp_path, cache_path)
+        except OSError:
+            pass  # e.g. read-only deployment; the computed matrix is still returned
+        return matrix
+
+    return cached_load(data_path, read, variant="cramers_v")
+
+
+#---Resampling tests for Cramér's V: bootstrap confidence intervals and permutation p-values---#
+#---Bootstrap: resampled code arrays are generated in NumPy blocks (block_size resamples x n rows at once)---#
+#---and counted with one np.bincount per block. Permutations: the count tables of shuffled target codes are---#
+#---drawn directly (see _permuted_tables). Blocks run in worker processes; every block draws from its own---#
+#---child of np.random.SeedSequence(seed), so results do not depend on the number of workers.---#
+
+RESAMPLE_BLOCK_SIZE = 200
+_worker_pair = None   # (x codes, y codes, n_x, n_y) of the worker process, set by _init_resample_worker
+
+
+def _init_resample_worker(x, y, n_x, n_y):
+    global _worker_pair
+    _worker_pair = (x, y, n_x, n_y)
+
+
+def _resample_block(task) -> tuple:
+    kind, seed_sequence, size = task
+    x, y, n_x, n_y = _worker_pair
+    rng = np.random.default_rng(seed_sequence)
+    if kind == "permutation":
+        return _cramers_v_batch(_permuted_tables(rng, np.bincount(x, minlength=n_x), np.bincount(y, minlength=n_y), size))
+    rows = rng.integers(0, len(x), size=(size, len(x)), dtype=np.int32)   # Draw profiles with replacement
+    cells = (x * n_y + y)[rows] + (np.arange(size, dtype=np.int32) * (n_x * n_y))[:, None]
+    counts = np.bincount(cells.ravel(), minlength=size * n_x * n_y).reshape(size, n_x, n_y)
+    return _cramers_v_batch(counts)
+
+
+def _permuted_tables(rng, row_sums: np.ndarray, column_sums: np.ndarray, size: int) -> np.ndarray:
+    # Count tables of `size` random permutations of the target codes. Shuffling the codes and counting gives
+    # tables with fixed margins whose cells follow a (multivariate) hypergeometric distribution, so the cells
+    # are drawn directly, one vectorized hypergeometric draw per cell: O(cells) instead of O(rows) per resample.
+    remaining = np.tile(column_sums.astype(np.int64), (size, 1))
+    counts = np.zeros((size, len(row_sums), len(column_sums)), dtype=np.int64)
+    for i, row_sum in enumerate(row_sums):
+        need = np.full(size, row_sum, dtype=np.int64)
+        left = remaining.sum(axis=1)
+        for j in range(len(column_sums) - 1):
+            left -= remaining[:, j]
+            drawn = rng.hypergeometric(remaining[:, j], left, need)
+            counts[:, i, j] = drawn
+            remaining[:, j] -= drawn
+            need -= drawn
+        counts[:, i, -1] = need
+        remaining[:, -1] -= need
+    return counts
+
+
+def resample_cramers_v(dframe: pd.DataFrame, x: int, y: int, n_resamples: int = 10000, confidence: float = 0.95,
+                       seed: int = 0, workers: int = None, block_size: int = RESAMPLE_BLOCK_SIZE) -> dict:
+    """
+    Cramér's V between two categorical variables with its uncertainty.
+
+    Parameters:
+    - dframe: input DataFrame (compact/categorical or plain)
+    - x: integer index of x-axis column (abscissa)
+    - y: integer index of y-axis column (ordinate)
+    - n_resamples: number of bootstrap resamples and of permutations
+    - confidence: level of the percentile bootstrap confidence intervals
+    - seed: seed of the random number generator (same seed -> same result)
+    - workers: worker processes; default: all cores. 1 computes in this process.
+    - block_size: resamples generated per NumPy block
+
+    Returns:
+    - dict with Cramers V, Cramers V (bias-corrected), their bootstrap confidence intervals (CI low/high)
+      and the permutation p-value (chance of a V at least as large if the variables were independent)
+    """
+    from concurrent.futures import ProcessPoolExecutor
+
+    x_codes, n_x = _category_codes(dframe.iloc[:, x])
+    y_codes, n_y = _category_codes(dframe.iloc[:, y])
+    valid = (x_codes >= 0) & (y_codes >= 0)   # Missing answers are left out, like pd.crosstab
+    x_codes, y_codes = x_codes[valid].astype(np.int32), y_codes[valid].astype(np.int32)
+
+    observed = np.bincount(x_codes * n_y + y_codes, minlength=n_x * n_y).reshape(1, n_x, n_y)
+    cramers_v, cramers_v_corrected = (float(v[0]) for v in _cramers_v_batch(observed))
+    if np.isnan(cramers_v):   # Only one answer in x or y: V, its intervals and its p-value are undefined
+        return {"Cramers V": np.nan, "CI low": np.nan, "CI high": np.nan,
+                "Cramers V (bias-corrected)": np.nan, "CI low (bias-corrected)": np.nan,
+                "CI high (bias-corrected)": np.nan, "Permutation p-value": np.nan,
+                "Resamples": n_resamples, "Confidence": confidence}
+
+    sizes = [min(block_size, n_resamples - start) for start in range(0, n_resamples, block_size)]
+    children = np.random.SeedSequence(seed).spawn(2 * len(sizes))
+    tasks = [("bootstrap", child, size) for child, size in zip(children[:len(sizes)], sizes)]
+    tasks += [("permutation", child, size) for child, size in zip(children[len(sizes):], sizes)]
+
+    workers = workers or os.cpu_count() or 1
+    initargs = (x_codes, y_codes, n_x, n_y)
+    if workers == 1:
+        _init_resample_worker(*initargs)
+        blocks = [_resample_block(task) for task in tasks]
+    else:
+        with ProcessPoolExecutor(max_workers=workers, initializer=_init_resample_worker, initargs=initargs) as pool:
+            blocks = list(pool.map(_resample_block, tasks))
+
+    bootstrap = [np.concatenate(values) for values in zip(*blocks[:len(sizes)])]
+    permutation = np.concatenate([v for v, _ in blocks[len(sizes):]])
+    tail = (1 - confidence) / 2 * 100
+
+    def interval(values):
+        # Resamples in which V is undefined (one answer left) are skipped; NaN if none is left
+        values = values[~np.isnan(values)]
+        return np.percentile(values, [tail, 100 - tail]) if len(values) else (np.nan, np.nan)
+
+    low, high = interval(bootstrap[0])
+    low_corrected, high_corrected = interval(bootstrap[1])
+
+    return {
+        "Cramers V": cramers_v,
+        "CI low": float(low),
+        "CI high": float(high),
+        "Cramers V (bias-corrected)": cramers_v_corrected,
+        "CI low (bias-corrected)": float(low_corrected),
+        "CI high (bias-corrected)": float(high_corrected),
+        "Permutation p-value": float((1 + np.sum(permutation >= cramers_v - 1e-12)) / (1 + n_resamples)),
+        "Resamples": n_resamples,
+        "Confidence": confidence,
+    }
+
+
+def load_resampled_cramers_v(key: str, x: int, y: int = 2, n_resamples: int = 10000, confidence: float = 0.95,
+                             seed: int = 0, workers: int = 1) -> dict:
+    """
+    resample_cramers_v of two columns of df_heat_<key>, computed once per dataset version (content hash),
+    columns, number of resamples, confidence level and seed.
+
+    Parameters:
+    - key: variant key, e.g. 'L' or 'S'
+    - x, y: integer indices of the two columns
+    - workers: worker processes (default: 1, no process pool inside the Streamlit server)
+    """
+    from utils.artifact_cache import cached_load
+    from utils.data_loader import load_shared_dataset
+    from utils.variants import DATA_PATH, VARIANTS
+
+    data_path = os.path.join(DATA_PATH, VARIANTS[key]["files"]["df_heat"])
+    return cached_load(
+        data_path,
+        lambda: resample_cramers_v(load_shared_dataset(data_path), x, y, n_resamples=n_resamples,
+                                   confidence=confidence, seed=seed, workers=workers),
+        variant=f"resample_x{x}_y{y}_n{n_resamples}_c{confidence}_seed{seed}",
+    )
+
+
+#---Streaming, mergeable contingency tables (out-of-core Chi-Square / Cramér's V)---#
+#---A ContingencyAccumulator holds only the answer vocabularies and the count tables of every feature---#
+#---against one target. It is updated chunk by chunk (e.g. from data_loader.iter_kaggle_survey), partial---#
+#---accumulators from worker processes or other survey years are merged, and the statistics are computed---#
+#---from the merged counts. Memory depends on the number of answers, not on the number of rows.---#
+
+class ContingencyAccumulator:
+    """
+    Count tables of every feature against one target column, built from chunks and mergeable.
+
+    Answers are matched across chunks and sources by their canonical form, so 3, 3.0 and "3" are the same answer.
+    """
+
+    def __init__(self, target: str, features=None):
+        self.target = target
+        self.features = list(features) if features is not None else None
+        self.vocabularies = {}   # column -> {canonical answer: code}
+        self.labels = {}         # column -> answers in code order (first seen form)
+        self.counts = {}         # feature -> int64 array (n_feature_answers, n_target_answers)
+        self.rows = 0
+
+    def _codes(self, column: str, series: pd.Series) -> np.ndarray:
+        from utils.columnar_cache import answer_key
+
+        vocabulary = self.vocabularies.setdefault(column, {})
+        labels = self.labels.setdefault(column, [])
+        if isinstance(series.dtype, pd.CategoricalDtype):
+            codes, uniques = series.cat.codes.to_numpy().astype(np.int64), series.cat.categories
+        else:
+            codes, uniques = pd.factorize(series)
+        mapping = []
+        for value in uniques:
+            key = answer_key(value)
+            if key not in vocabulary:
+                vocabulary[key] = len(vocabulary)
+                labels.append(value)
+            mapping.append(vocabulary[key])
+        mapping = np.append(np.asarray(mapping, dtype=np.int64), -1)   # Code -1 (missing) stays -1
+        return mapping[codes]
+
+    def _add(self, feature: str, table: np.ndarray):
+        current = self.counts.get(feature)
+        if current is None:
+            self.counts[feature] = table.astype(np.int64)
+            return
+        if current.shape != table.shape:   # New answers since the last update: grow the table
+            grown = np.zeros(np.maximum(current.shape, table.shape), dtype=np.int64)
+            grown[:current.shape[0], :current.shape[1]] = current
+            current = grown
+        current[:table.shape[0], :table.shape[1]] += table
+        self.counts[feature] = current
+
+    def update(self, chunk: pd.DataFrame) -> ContingencyAccumulator:
+        """
+        Count the rows of one chunk. Rows with a missing answer are left out of that feature's table, like pd.crosstab.
+        """
+        features = self.features or [column for column in chunk.columns if column != self.target]
+        y = self._codes(self.target, chunk[self.target])
+        for feature in features:
+            x = self._codes(feature, chunk[feature])
+            n_x, n_y = len(self.labels[feature]), len(self.labels[self.target])
+            valid = (x >= 0) & (y >= 0)
+            self._add(feature, np.bincount(x[valid] * n_y + y[valid], minlength=n_x * n_y).reshape(n_x, n_y))
+        self.rows += len(chunk)
+        return self
+
+    def merge(self, other: ContingencyAccumulator) -> ContingencyAccumulator:
+        """
+        Add the counts of another accumulator (e.g. from a worker process or another survey year).
+        """
+        if other.target != self.target:
+            raise ValueError(f"Cannot merge accumulators of different targets ({self.target} vs. {other.target})")
+
+        def remap(column):
+            # Codes of `other` -> codes of self, adding answers self has not seen yet
+            vocabulary = self.vocabularies.setdefault(column, {})
+            labels = self.labels.setdefault(column, [])
+            for key, label in zip(other.vocabularies[column], other.labels[column]):
+                if key not in vocabulary:
+                    vocabulary[key] = len(vocabulary)
+                    labels.append(label)
+            return np.array([vocabulary[key] for key in other.vocabularies[column]], dtype=np.int64)
+
+        target_codes = remap(other.target)
+        for feature, table in other.counts.items():
+            feature_codes = remap(feature)
+            remapped = np.zeros((len(self.labels[feature]), len(self.labels[self.target])), dtype=np.int64)
+            remapped[np.ix_(feature_codes, target_codes)] = table
+            self._add(feature, remapped)
+        self.rows += other.rows
+        return self
+
+    def contingency_table(self, feature: str) -> pd.DataFrame:
+        """
+        Count table of one feature, oriented like test_chisquare (target answers as rows), unobserved answers dropped.
+        """
+        table = self.counts[feature]
+        table = pd.DataFrame(table.T, index=self.labels[self.target][:table.shape[1]],
+                             columns=self.labels[feature][:table.shape[0]])
+        return table.loc[table.sum(axis=1) > 0, table.sum(axis=0) > 0]
+
+    def results(self) -> pd.DataFrame:
+        """
+        Chi2 Statistic, p-value, Degrees of Freedom and Cramér's V of every feature against the target
+        (same values as test_chisquare_all on the concatenated chunks).
+        """
+        n_y = len(self.labels[self.target])
+        rows = []
+        for feature, table in self.counts.items():
+            padded = np.zeros((table.shape[0], n_y), dtype=np.int64)
+            padded[:, :table.shape[1]] = table
+            rows.append(_chisquare_from_counts(padded))
+        return pd.DataFrame(rows, index=pd.Index(list(self.counts), name="Question"))
+
+
+def _accumulate_chunk(chunk: pd.DataFrame, target: str, features) -> ContingencyAccumulator:
+    return ContingencyAccumulator(target, features).update(chunk)
+
+
+def accumulate_contingency(chunks, target: str, features=None, workers: int = None) -> ContingencyAccumulator:
+    """
+    Count tables of every feature against the target over a stream of chunks.
+
+    Parameters:
+    - chunks: iterable of DataFrames, e.g. data_loader.iter_kaggle_survey(questions=['Q5', 'Q6'])
+    - target: target column, e.g. 'Q5'
+    - features: feature columns (default: all other columns)
+    - workers: worker processes; default: all cores. 1 counts in this process.
+
+    Returns:
+    - merged ContingencyAccumulator (see .results() and .contingency_table())
+    """
+    from collections import deque
+    from concurrent.futures import ProcessPoolExecutor
+
+    total = ContingencyAccumulator(target, features)
+    workers = workers or os.cpu_count() or 1
+    if workers == 1:
+        for chunk in chunks:
+            total.update(chunk)
+        return total
+
+    with ProcessPoolExecutor(max_workers=workers) as pool:
+        pending = deque()
+        for chunk in chunks:
+            pending.append(pool.submit(_accumulate_chunk, chunk, target, features))
+            if len(pending) >= 2 * workers:   # Bounded read-ahead keeps memory flat for any file size
+                total.merge(pending.popleft().result())
+        while pending:
+            total.merge(pending.popleft().result())
+    return total
+
+
+def test_chisquare_streaming(chunks, target: str, features=None, workers: int = None) -> pd.DataFrame:
+    """
+    test_chisquare_all over a stream of chunks, with bounded memory (see accumulate_contingency).
+    """
+    return accumulate_contingency(chunks, target, features, workers).results()
+
+
+if __name__ == "__main__":
+    # Out-of-core Chi-Square / Cramér's V of every question against a target, e.g. for the raw Kaggle survey:
+    #   python -m utils.statistic_functions data/kaggle_survey_2020_responses.csv --target Q5 --sep , --skip-question-row
+    import argparse
+    import sys
+
+    parser = argparse.ArgumentParser(prog="python -m utils.statistic_functions",
+                                     description="Chi-Square test and Cramér's V of every column against a target, "
+                                                 "streamed chunk by chunk.")
+    parser.add_argument("inputs", nargs="+", help="CSV file(s), e.g. several survey years; their counts are merged")
+    parser.add_argument("--target", required=True, help="target column, e.g. Q5")
+    parser.add_argument("--sep", default=';', help="separator of the input files (default: ';')")
+    parser.add_argument("--chunksize", type=int, default=5000, help="rows per chunk")
+    parser.add_argument("--workers", type=int, default=None, help="worker processes (default: all cores)")
+    parser.add_argument("--skip-question-row", action="store_true",
+                        help="drop the second line (question texts) of raw Kaggle survey files")
+    args = parser.parse_args()
+
+    def chunks():
+        for path in args.inputs:
+            yield from pd.read_csv(path, sep=args.sep, dtype='str', chunksize=args.chunksize,
+                                   skiprows=[1] if args.skip_question_row else None)
+
+    accumulator = accumulate_contingency(chunks(), args.target, workers=args.workers)
+    print(f"{accumulator.rows} rows, {len(accumulator.counts)} features", file=sys.stderr)
+    accumulator.results().sort_values("Cramers V", ascending=False).to_csv(sys.stdout, sep=';')
@@ -0,0 +1,243 @@
+from __future__ import annotations   # Type hints stay strings, so pd.DataFrame does not import pandas
+
+#---Import of modules and functions---#
+
+import json
+import os
+import sys
+from utils.artifact_cache import cached_load, content_hash
+from utils.columnar_cache import CACHE_DIR
+from utils.fast_inference import compile_preprocessor, encode_frame
+from utils.lazy_import import lazy_module
+from utils.manifest import verify_artifact
+from utils.variants import DATA_PATH, VARIANTS
+
+np = lazy_module("numpy")
+pd = lazy_module("pandas")
+
+
+#---Pipelines compiled to plain arrays, scored with NumPy only---#
+#---The export step turns the encoders and the XGBoost tree ensemble of a pickled pipeline into---#
+#---data/compiled_model_<key>.npz: one JSON spec for the encoders and contiguous node arrays---#
+#---(feature, threshold, children, default direction, leaf value) for all trees.---#
+#---Scoring needs neither scikit-learn nor xgboost, so no unpickling and no heavy imports.---#
+#---A model exported from an older pickle is re-exported at runtime into data/_cache (named by the hash of---#
+#---the pickle); the tracked files in data/ are only written by the export step, which also refreshes the---#
+#---manifest:  python -m utils.tree_evaluator---#
+
+FORMAT_VERSION = 1
+
+
+def compiled_model_path(key: str) -> str:
+    return os.path.join(DATA_PATH, f"compiled_model_{key}.npz")
+
+
+def _model_path(key: str) -> str:
+    return os.path.join(DATA_PATH, VARIANTS[key]["files"]["model"])
+
+
+def _rebuilt_model_path(key: str, source_sha256: str) -> str:
+    # Runtime re-exports go to the ignored cache directory, never over the tracked (manifest-checked) file
+    return os.path.join(CACHE_DIR, f"compiled_model_{key}.{source_sha256[:12]}.npz")
+
+
+def _plain(value):
+    # numpy scalars -> Python scalars, so JSON keeps the type (int stays int, str stays str)
+    return value.item() if hasattr(value, "item") else value
+
+
+def _export_encoders(preprocessor) -> list:
+    encoders = []
+    for feature in compile_preprocessor(preprocessor)["features"]:
+        entry = {"column": feature["column"], "kind": feature["kind"],
+                 "lookup": [[_plain(category), _plain(value)] for category, value in feature["lookup"].items()]}
+        if feature["kind"] == "ordinal":
+            entry["position"] = feature["position"]
+            entry["unknown"] = feature["unknown"]
+        encoders.append(entry)
+    return encoders
+
+
+def _export_trees(classifier) -> dict:
+    learner = json.loads(classifier.get_booster().save_raw("json"))["learner"]
+    model = learner["gradient_booster"]["model"]
+    trees = model["trees"]
+
+    # All trees in one set of arrays; children are global node indexes, leaves point to themselves
+    sizes = [len(tree["left_children"]) for tree in trees]
+    offsets = np.concatenate([[0], np.cumsum(sizes)[:-1]]).astype(np.int32)
+    left, right = [], []
+    for tree, offset in zip(trees, offsets):
+        own = np.arange(len(tree["left_children"]), dtype=np.int32) + offset
+        tree_left = np.asarray(tree["left_children"], dtype=np.int32)
+        leaf = tree_left == -1
+        left.append(np.where(leaf, own, tree_left + offset))
+        right.append(np.where(leaf, own, np.asarray(tree["right_children"], dtype=np.int32) + offset))
+
+    depth = 0
+    for tree in trees:   # Longest root-to-leaf path = number of evaluation rounds
+        stack = [(0, 0)]
+        while stack:
+            node, d = stack.pop()
+            depth = max(depth, d)
+            if tree["left_children"][node] != -1:
+                stack += [(tree["left_children"][node], d + 1), (tree["right_children"][node], d + 1)]
+
+    base_score = json.loads(learner["learner_model_param"]["base_score"].replace("E", "e"))
+    return {
+        "arrays": {
+            "roots": offsets,
+            "tree_class": np.asarray(model["tree_info"], dtype=np.int32),
+            "feature": np.concatenate([tree["split_indices"] for tree in trees]).astype(np.int32),
+            "threshold": np.concatenate([tree["split_conditions"] for tree in trees]).astype(np.float32),
+            "left": np.concatenate(left),
+            "right": np.concatenate(right),
+            "default_left": np.concatenate([tree["default_left"] for tree in trees]).astype(bool),
+            "base_score": np.atleast_1d(np.asarray(base_score, dtype=np.float64)),
+        },
+        "max_depth": depth,
+        "objective": learner["objective"]["name"],
+        "num_class": int(learner["learner_model_param"]["num_class"]),
+    }
+
+
+def export_compiled_model(key: str, path: str = None) -> str:
+    """
+    Compile the pickled pipeline of a variant ('L' or 'S') into data/compiled_model_<key>.npz.
+    This is the only step that needs scikit-learn and xgboost.
+
+    Returns:
+    - path of the written file
+    """
+    import joblib
+    model = joblib.load(_model_path(key))
+    preprocessor, classifier = model.steps[0][1], model.steps[-1][1]
+    if classifier._get_iteration_range(None) != (0, 0):
+        raise ValueError("Pipelines with early stopping (best_iteration) are not supported")
+
+    trees = _export_trees(classifier)
+    if trees["objective"] not in ("multi:softmax", "multi:softprob"):
+        raise ValueError(f"Unsupported objective {trees['objective']}")
+    spec = {
+        "version": FORMAT_VERSION,
+        "source_sha256": content_hash(_model_path(key)),
+        "objective": trees["objective"],
+        "num_class": trees["num_class"],
+        "max_depth": trees["max_depth"],
+        "classes": [_plain(c) for c in classifier.classes_],
+        "n_outputs": int(classifier.n_features_in_),
+        "encoders": _export_encoders(preprocessor),
+    }
+
+    path = path or compiled_model_path(key)
+    tmp_path = f"{path}.{os.getpid()}.tmp.npz"
+    np.savez_compressed(tmp_path, spec=np.array(json.dumps(spec, ensure_ascii=False)), **trees["arrays"])
+    os.replace(tmp_path, path)
+    return path
+
+
+class CompiledModel:
+    """
+    Array-based copy of a pipeline: encoders as lookup tables, trees as node arrays.
+    predict_proba scores a whole batch with a few vectorized NumPy operations per tree level.
+    """
+
+    def __init__(self, path: str):
+        with np.load(path, allow_pickle=False) as data:
+            self.spec = json.loads(str(data["spec"]))
+            for name in ("roots", "tree_class", "feature", "threshold", "left", "right", "default_left", "base_score"):
+                setattr(self, name, data[name])
+        self.classes_ = np.asarray(self.spec["classes"])
+        self.feature_names_in_ = np.asarray([encoder["column"] for encoder in self.spec["encoders"]], dtype=object)
+        self.n_outputs = self.spec["n_outputs"]
+        self.encoders = [
+            {**encoder, "lookup": {category: value for category, value in encoder["lookup"]}}
+            for encoder in self.spec["encoders"]
+        ]
+        # Leaf values are stored as split_conditions of leaf nodes
+        self.leaf_value = self.threshold.astype(np.float64)
+        # Leaves compare against +inf and default to the left child (= themselves), so they stay put
+        leaf = self.left == np.arange(len(self.left))
+        self.split = np.where(leaf, np.float32(np.inf), self.threshold).astype(np.float32)
+        self.default_left = self.default_left | leaf
+        # XGBoost allocates the children of a node as a pair (right = left + 1), which saves one gather per level
+        self.paired = bool(np.all(self.right[~leaf] == self.left[~leaf] + 1))
+
+    def encode(self, df: pd.DataFrame) -> np.ndarray:
+        """
+        Encoded feature matrix (float32, as XGBoost sees it) of a DataFrame of profiles.
+        """
+        return encode_frame({"features": self.encoders, "n_outputs": self.n_outputs}, df, np.float32)
+
+    def predict_margin(self, X: np.ndarray) -> np.ndarray:
+        """
+        Raw scores (n_profiles, n_classes) of an encoded feature matrix.
+        """
+        X = np.asarray(X, dtype=np.float32)
+        n_rows, n_columns = X.shape
+        flat = X.ravel()
+        row_offset = (np.arange(n_rows, dtype=np.int64) * n_columns)[:, None]
+        has_missing = bool(np.isnan(flat).any())
+        node = np.broadcast_to(self.roots, (n_rows, len(self.roots))).copy()
+        for _ in range(self.spec["max_depth"]):
+            value = flat[row_offset + self.feature[node]]
+            go_left = value < self.split[node]
+            if has_missing:
+                go_left = np.where(np.isnan(value), self.default_left[node], go_left)
+            if self.paired:
+                node = self.left[node] + ~go_left
+            else:
+                node = np.where(go_left, self.left[node], self.right[node])
+
+        leaves = self.leaf_value[node]
+        margin = np.empty((len(X), self.spec["num_class"]))
+        for c in range(self.spec["num_class"]):
+            margin[:, c] = self.base_score[c % len(self.base_score)] + leaves[:, self.tree_class == c].sum(axis=1)
+        return margin
+
+    def predict_proba(self, df: pd.DataFrame) -> np.ndarray:
+        """
+        Class probabilities (n_profiles, n_classes), within 1e-6 of the pipeline's predict_proba.
+        """
+        margin = self.predict_margin(self.encode(df))
+        # multi:softmax and multi:softprob both turn the raw scores into probabilities with softmax
+        margin = np.exp(margin - margin.max(axis=1, keepdims=True))
+        return margin / margin.sum(axis=1, keepdims=True)
+
+
+def load_compiled_model(key: str) -> CompiledModel:
+    """
+    The compiled model of a variant, held once per process: the tracked file in data/ if it was
+    exported from the deployed pickle, otherwise a copy re-exported into data/_cache
+    (this needs scikit-learn/xgboost).
+    """
+    path = compiled_model_path(key)
+    source_sha256 = content_hash(_model_path(key)) if os.path.exists(_model_path(key)) else None
+
+    def reader(model_path):
+        def read():
+            verify_artifact(model_path)   # Only checks the tracked file in data/
+            return CompiledModel(model_path)
+        return read
+
+    if os.path.exists(path):
+        model = cached_load(path, reader(path))
+        if source_sha256 is None or model.spec["source_sha256"] == source_sha256:
+            return model
+    elif source_sha256 is None:
+        raise FileNotFoundError(f"Neither {os.path.basename(path)} nor {os.path.basename(_model_path(key))} exists")
+
+    rebuilt_path = _rebuilt_model_path(key, source_sha256)
+    if not os.path.exists(rebuilt_path):
+        os.makedirs(CACHE_DIR, exist_ok=True)
+        export_compiled_model(key, rebuilt_path)
+    return cached_load(rebuilt_path, reader(rebuilt_path))
+
+
+if __name__ == "__main__":
+    from utils.manifest import build_manifest
+    for key in VARIANTS:
+        written = export_compiled_model(key)
+        print(f"Wrote {os.path.basename(written)} ({os.path.getsize(written) / 1024:.0f} KB)")
+    print(f"Refreshed manifest.json ({len(build_manifest(write=True))} artifacts)")
+    sys.exit(0)
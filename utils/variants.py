@@ -0,0 +1,123 @@
+#---Import of modules and functions---#
+
+import os
+import json
+from utils.artifact_cache import cached_load, content_hash
+from utils.columnar_cache import CACHE_DIR, read_csv_columnar
+from utils.data_loader import load_category_order
+from utils.lazy_import import lazy_module
+
+pd = lazy_module("pandas")
+joblib = lazy_module("joblib")
+
+
+#---Registry of the target variants (L = broad career role, S = specific career role)---#
+#---Everything that belongs to one variant is packaged into one bundle and loaded in a single I/O pass.---#
+#---A new target variant only needs a new entry here (plus its files in data/).---#
+
+VARIANTS = {
+    "L": {
+        "label": "Broad career role",
+        "files": {
+            "df_heat": "df_heat_L.csv",
+            "model": "pipe_xgb_L.pkl",
+            "shap": "shap_feature_importance_all_classes_L.csv",
+            "defaults": "default_X_train_L.csv",
+            "unique_values": "unique_values_per_feature_L.json",
+        },
+        # UI class name -> model class label (always as string)
+        "classes": {"Data Science": "0", "Tech": "1"},
+    },
+    "S": {
+        "label": "Specific career role",
+        "files": {
+            "df_heat": "df_heat_S.csv",
+            "model": "pipe_xgb_S.pkl",
+            "shap": "shap_feature_importance_all_classes_S.csv",
+            "defaults": "default_X_train_S.csv",
+            "unique_values": "unique_values_per_feature_S.json",
+        },
+        "classes": {"Data Analyst": "0", "Data Scientist": "1", "Software Engineer": "2"},
+    },
+}
+
+BUNDLE_VERSION = 2
+DATA_PATH = os.path.join(os.path.dirname(os.path.dirname(__file__)), "data")
+
+
+def _source_paths(key: str) -> list:
+    # The model is not part of the bundle: it is held once per process by utils/model_loader.py
+    return [os.path.join(DATA_PATH, filename) for name, filename in VARIANTS[key]["files"].items() if name != "model"]
+
+
+def _build_variant(key: str) -> dict:
+    # Read every artifact of the variant from its source file
+    spec = VARIANTS[key]
+    path = lambda name: os.path.join(DATA_PATH, spec["files"][name])
+
+    shap = pd.read_csv(path("shap"), sep=';')
+    # First column holds the questions, then one column per class (same order as 'classes')
+    shap = shap.rename(columns=dict(zip(shap.columns, ["Question"] + list(spec["classes"]))))
+    with open(path("unique_values"), "r", encoding="utf-8-sig") as f:
+        unique_values = json.load(f)
+
+    return {
+        "key": key,
+        "label": spec["label"],
+        "classes": dict(spec["classes"]),
+        "data": read_csv_columnar(path("df_heat"), compact=True, category_order=load_category_order(), sep=';'),
+        "shap": shap,
+        "defaults": pd.read_csv(path("defaults"), sep=';', encoding='utf-8-sig'),
+        "unique_values": unique_values,
+    }
+
+
+def bundle_path_for(key: str) -> str:
+    return os.path.join(CACHE_DIR, f"variant_{key}.joblib")
+
+
+def _read_variant(key: str) -> dict:
+    sources = {os.path.basename(p): content_hash(p) for p in _source_paths(key)}
+    bundle_path = bundle_path_for(key)
+
+    # One file open for the whole variant, as long as it was built from the current sources
+    try:
+        bundle = joblib.load(bundle_path)
+        if bundle.get("version") == BUNDLE_VERSION and bundle.get("sources") == sources:
+            return bundle["variant"]
+    except (OSError, EOFError, ValueError, KeyError, AttributeError):
+        pass
+
+    variant = _build_variant(key)
+    try:
+        os.makedirs(CACHE_DIR, exist_ok=True)
+        tmp_path = f"{bundle_path}.{os.getpid()}.tmp"
+        joblib.dump({"version": BUNDLE_VERSION, "sources": sources, "variant": variant}, tmp_path)
+        os.replace(tmp_path, bundle_path)
+    except OSError:
+        pass  # Read-only deployment: keep the variant in memory only
+    return variant
+
+
+def load_variant(key: str) -> dict:
+    """
+    Load everything that belongs to one target variant.
+
+    Parameters:
+    - key: variant key from VARIANTS, e.g. 'L' or 'S'
+
+    Returns:
+    - dict with 'label', 'classes' (UI name -> model class label), 'data' (compact df_heat),
+      'shap', 'defaults' and 'unique_values'. The values are shared by all sessions and must not
+      be modified in place (derive new frames with .assign()/.copy() instead).
+      The model is served by utils.model_loader.get_model_service(key).
+    """
+    variant = cached_load(_source_paths(key), lambda: _read_variant(key), variant=f"variant={key}", copy=False)
+    return dict(variant)
+
+
+def variant_labels() -> dict:
+    """
+    Variant key -> label shown in the UI, e.g. {'L': 'Broad career role', 'S': 'Specific career role'}.
+    """
+    return {key: spec["label"] for key, spec in VARIANTS.items()}
@@ -1,10 +1,14 @@
+from __future__ import annotations   # Type hints stay strings, so pd.DataFrame does not import pandas
+
 #---Import of modules and functions---#
 import os
-import pandas as pd
-import matplotlib.pyplot as plt
-import seaborn as sns
 import streamlit as st
-import numpy as np
+from utils.lazy_import import lazy_module   # Plotting libraries are imported on first plot
+
+pd = lazy_module("pandas")
+plt = lazy_module("matplotlib.pyplot")
+sns = lazy_module("seaborn")
+np = lazy_module("numpy")
 
 
 #---Simple Countplot to make a first dig into data---#
@@ -179,6 +183,54 @@ def plot_heatmap_row_percent(df: pd.DataFrame, x_col: str, y_index: int = 2, que
     st.pyplot(fig)
 
 
+# --- Plotting the pairwise Cramér's V of all questions (redundancy between answers) ---#
+
+def plot_cramers_v_matrix(matrix: pd.DataFrame, question_map=None):
+    """
+    Creates a heatmap of the pairwise Cramér's V between all questions (lower triangle).
+
+    Args:
+        matrix (pd.DataFrame): Symmetric Cramér's V matrix with the question names as index and columns.
+        question_map (dict): Optional dict to map column names to short labels.
+
+    Returns:
+        matplotlib.figure.Figure: The Matplotlib figure object containing the plot.
+    """
+    # Define CI colors
+    TEXT = '#31333F'        # Text (Dark gray)
+    BACKGROUND = '#F0F2F6'  # Background (Light gray)
+
+    labels = [question_map.get(col, col) if question_map else col for col in matrix.columns]
+    labels = [label if len(label) <= 40 else label[:37] + "..." for label in labels]
+
+    fig, ax = plt.subplots(figsize=(14, 12))
+    fig.patch.set_facecolor(BACKGROUND)  # Set background color
+
+    # Upper triangle and diagonal repeat the lower triangle, so only the lower triangle is drawn
+    lower = pd.DataFrame(matrix.to_numpy(), index=labels, columns=labels).iloc[1:, :-1]
+    sns.heatmap(
+        lower,
+        mask=np.triu(np.ones(lower.shape, dtype=bool), k=1),
+        annot=True,
+        fmt='.2f',
+        annot_kws={'fontsize': 7},
+        vmin=0,
+        vmax=1,
+        cmap='Reds',
+        cbar_kws={'label': "Cramér's V"},
+        ax=ax
+    )
+
+    ax.set_title("Association between the Answers (Cramér's V)\n", fontsize=18, color=TEXT)
+
+    plt.setp(ax.get_xticklabels(), color=TEXT, rotation=90)
+    plt.setp(ax.get_yticklabels(), color=TEXT, rotation=0)
+
+    plt.tight_layout()
+
+    return fig
+
+
 # --- Plotting a confusion matrix (very nice stuff) ---#
 
 def plot_confusion_matrix(conf_matrix_dict, title="Confusion Matrix"):
@@ -296,6 +348,97 @@ def plot_shap_feature_importance_bar(df: pd.DataFrame, category: str, n_features
     return fig
 
 
+def plot_local_shap_contributions(df: pd.DataFrame, category: str, n_features: int = 10):
+    """
+    Creates a horizontal bar plot of the local SHAP values of one user profile:
+    answers that raise the score in the primary color, answers that lower it in the accent color.
+
+    Args:
+        df (pd.DataFrame): DataFrame with a 'Question' column and one column of local SHAP values per category.
+        category (str): The column whose values are plotted (e.g., 'Data Analyst').
+        n_features (int): The number of features with the largest absolute impact to display.
+
+    Returns:
+        matplotlib.figure.Figure: The Matplotlib figure object containing the plot.
+    """
+    # Define CI colors
+    PRIMARY = '#FF4B4B'     # Primary (Red)
+    ACCENT = '#00A8E8'      # Accent (Blue)
+    TEXT = '#31333F'        # Text (Dark gray)
+    BACKGROUND = '#F0F2F6'  # Background (Light gray)
+
+    # Largest absolute impact first, positive and negative alike
+    plot_df = df.loc[df[category].abs().sort_values(ascending=False).index[:n_features], ['Question', category]]
+
+    fig, ax = plt.subplots(figsize=(12, 8))
+    fig.patch.set_facecolor(BACKGROUND)  # Set background color
+
+    colors = [PRIMARY if value >= 0 else ACCENT for value in plot_df[category]]
+    ax.barh(plot_df['Question'], plot_df[category], color=colors)
+    ax.invert_yaxis()   # Most important feature on top
+    ax.axvline(0, color=TEXT, linewidth=0.8)
+
+    ax.set_xlabel("Local SHAP Value (log-odds, > 0 raises your score)", fontsize=12, color=TEXT)
+    ax.set_ylabel("Question / Feature", fontsize=12, color=TEXT)
+    ax.set_title(f"Impact of your Answers on {category}", fontsize=14, color=TEXT)
+
+    plt.setp(ax.get_xticklabels(), color=TEXT)
+    plt.setp(ax.get_yticklabels(), color=TEXT)
+
+    plt.tight_layout()
+
+    return fig
+
+
+# --- Plotting the Role Score for every combination of two answers (what-if grid) ---#
+
+def plot_what_if_heatmap(scores, values_a: list, values_b: list, feature_a: str, feature_b: str, category: str,
+                         current=None):
+    """
+    Creates a heatmap of the role score (%) for every combination of two answers.
+
+    Args:
+        scores (np.ndarray): Role scores in percent, shape (len(values_a), len(values_b)).
+        values_a (list): Answers of feature_a (rows, in ordinal order).
+        values_b (list): Answers of feature_b (columns, in ordinal order).
+        feature_a (str): Question shown on the y-axis.
+        feature_b (str): Question shown on the x-axis.
+        category (str): The role the scores belong to (e.g., 'Data Analyst').
+        current (tuple): Optional (row, column) of the user's current answers, highlighted with a frame.
+
+    Returns:
+        matplotlib.figure.Figure: The Matplotlib figure object containing the plot.
+    """
+    # Define CI colors
+    TEXT = '#31333F'        # Text (Dark gray)
+    BACKGROUND = '#F0F2F6'  # Background (Light gray)
+
+    fig, ax = plt.subplots(figsize=(12, 8))
+    fig.patch.set_facecolor(BACKGROUND)  # Set background color
+
+    sns.heatmap(
+        pd.DataFrame(scores, index=[str(v) for v in values_a], columns=[str(v) for v in values_b]),
+        annot=True,
+        fmt='.0f',
+        cmap='Reds',
+        cbar_kws={'label': f'{category} score (%)'},
+        ax=ax
+    )
+    if current is not None:
+        ax.add_patch(plt.Rectangle((current[1], current[0]), 1, 1, fill=False, edgecolor=TEXT, linewidth=3))
+
+    ax.set_xlabel(feature_b, fontsize=12, color=TEXT)
+    ax.set_ylabel(feature_a, fontsize=12, color=TEXT)
+    ax.set_title(f"Your {category} Score for every Combination of two Answers", fontsize=14, color=TEXT)
+
+    plt.setp(ax.get_xticklabels(), color=TEXT, rotation=45)
+    plt.setp(ax.get_yticklabels(), color=TEXT, rotation=0)
+
+    plt.tight_layout()
+
+    return fig
+
+
 # --- Plotting the Role Score for the RoleRecommender ---#
 
 def plot_role_score_benchmark_vs_user(benchmark_score, user_score, class_name="Role"):